@@ -1,6 +1,10 @@
+from cachetools import LRUCache
 from cryptography.fernet import Fernet
+from datetime import datetime
+from django.conf import settings
 import json
 import os
+import threading
 
 STATIC_KEY = (
     "4xu3i8YiTDl5Zm7HOAZTPlHh3gpqBbe7Gfn6vanqPyI=".encode()
@@ -10,6 +14,12 @@ STATIC_KEY = (
 
 f = Fernet(STATIC_KEY)
 
+# Raw auth_token -> its decrypted (google_id, last_login), so requires_login can skip the decrypt and parse for
+# tokens it has already seen. They only depend on the token, so entries never need invalidating: whether the token
+# is still current is checked against the user's last_login.
+_token_fields_cache = LRUCache(maxsize=settings.TOKEN_CACHE_SIZE)
+_token_fields_lock = threading.Lock()
+
 
 def decrypt_token(token) -> tuple:
     decrypted = f.decrypt(token).decode()
@@ -19,3 +29,19 @@ def decrypt_token(token) -> tuple:
 def encrypt_token(google_id, last_login) -> bytes:
     byte_string = json.dumps({"google_id": google_id, "last_login": str(last_login)}).encode()
     return f.encrypt(byte_string).decode()
+
+
+def parse_token_fields(token) -> tuple:
+    with _token_fields_lock:
+        fields = _token_fields_cache.get(token)
+    if fields is None:
+        token_json = decrypt_token(token)
+        fields = (token_json["google_id"], datetime.strptime(token_json["last_login"], "%Y-%m-%d %H:%M:%S.%f%z"))
+        with _token_fields_lock:
+            _token_fields_cache[token] = fields
+    return fields
+
+
+def clear_token_fields_cache() -> None:
+    with _token_fields_lock:
+        _token_fields_cache.clear()
@@ -5,16 +5,24 @@ Business logic for account related operations.
 """
 from . import query
 from account.models import User, Privacy, FriendRequest
-from typing import Tuple
+from typing import Optional, Tuple
+from django.db import transaction
 from django.core.exceptions import ValidationError, ObjectDoesNotExist
 from column.business import create_default_columns
-from account.auth_utils import decrypt_token, encrypt_token
+from jamco import cache as user_cache
+from account.auth_utils import decrypt_token, encrypt_token, parse_token_fields
 from datetime import datetime
+import base64
+import json
 
+# Maximum number of users returned by a single name search
+SEARCH_RESULT_LIMIT = 50
 
+
+@transaction.atomic
 def get_or_create_user(payload: dict) -> Tuple[User, bool]:
-    is_new = not query.user_exists(payload["sub"])
-    user = query.get_or_create_user(payload)
+    # A new user gets their columns and privacies in the same transaction, so there's never a half-provisioned account
+    user, is_new = query.get_or_create_user(payload)
     if is_new:
         create_default_columns(user.id)
         query.create_privacies(user.id)
@@ -34,8 +42,28 @@ def update_user(payload: dict) -> None:
         raise AttributeError(err.message + " - " + payload.get("birthday"))
 
 
+def get_account_etag(name: str, user_id: int) -> str:
+    # Changes to the user's account data bump their account version, which retires this etag
+    return f"{name}-{user_id}-{query.get_version(user_id)}"
+
+
+def get_user_data_etag(token) -> Optional[str]:
+    """
+    Returns the etag for the user data behind token, or None when the token doesn't authenticate anyone.
+    Anything wrong with the token is left to the view to answer.
+    """
+    try:
+        found = query.get_user_version_by_token_fields(*parse_token_fields(token))
+    except Exception:
+        return None
+    if found is None:
+        return None
+    user_id, version = found
+    return f"user-{user_id}-{version}"
+
+
 def get_privacies(user_id: int) -> Privacy:
-    return query.get_privacies(user_id)
+    return user_cache.get_or_load(user_cache.PRIVACIES, user_id, lambda: query.get_privacies(user_id))
 
 
 def update_privacies(payload: dict) -> None:
@@ -54,32 +82,50 @@ def add_friend(user1_id, user2_id):
         query.add_friend(user1_id, user2_id)
 
 
+def are_friends(user1_id, user2_id) -> bool:
+    return query.are_friends(user1_id, user2_id)
+
+
 def remove_friend(user1_id, user2_id):
     if not query.are_friends(user1_id, user2_id):
         raise ObjectDoesNotExist("Error Removing Friends")
     query.remove_friend(user1_id, user2_id)
 
 
-def search_users_by_name(search_string) -> list:
-    search_string = str.lower(search_string).strip()
-    toks = str.split(search_string)
-    result = []
+def search_users_by_name(search_string, limit=SEARCH_RESULT_LIMIT, cursor=None) -> Tuple[list, str]:
+    """
+    Returns one page of searchable users matching every token of search_string, best matches first,
+    along with the cursor for the next page (None when there are no more results).
+    """
+    toks = str.split(str.lower(search_string))
     # No mass-searching allowed
-    if search_string != "":
-        for usr in query.get_all_searchable():
-            success = True
-            first_lower = str.lower(usr.first_name)
-            last_lower = str.lower(usr.last_name)
-            for tok in toks:
-                if tok not in first_lower and tok not in last_lower:
-                    success = False
-                    break
-            if success:
-                result.append(
-                    {"id": usr.id, "first_name": usr.first_name, "last_name": usr.last_name, "country": usr.country}
-                )
-
-    return result
+    if not toks:
+        return [], None
+    limit = max(1, min(int(limit), SEARCH_RESULT_LIMIT))
+    after = _decode_search_cursor(cursor) if cursor else None
+
+    # fetch one extra row to find out whether another page exists
+    users = list(query.search_searchable_users(toks, limit + 1, after))
+    next_cursor = _encode_search_cursor(users[limit - 1].rank, users[limit - 1].id) if len(users) > limit else None
+    result = [
+        {"id": usr.id, "first_name": usr.first_name, "last_name": usr.last_name, "country": usr.country}
+        for usr in users[:limit]
+    ]
+    return result, next_cursor
+
+
+def _encode_search_cursor(rank: int, user_id: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps([rank, user_id]).encode()).decode()
+
+
+def _decode_search_cursor(cursor: str) -> tuple[int, int]:
+    if not isinstance(cursor, str):
+        raise ValueError("Invalid search cursor")
+    try:
+        rank, user_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return int(rank), int(user_id)
+    except (ValueError, TypeError) as err:
+        raise ValueError("Invalid search cursor") from err
 
 
 def validate_token(token) -> bool:
@@ -94,6 +140,17 @@ def validate_token(token) -> bool:
         raise ObjectDoesNotExist("Failed to Authenticate Token") from err
 
 
+def validate_token_cached(token) -> User:
+    """
+    Same as validate_token, but reuses the token's decrypted fields from earlier requests, and looks the user up
+    through the shared user cache (see jamco/cache.py).
+    """
+    try:
+        return query.get_user_by_token_fields_cached(*parse_token_fields(token))
+    except ObjectDoesNotExist as err:
+        raise ObjectDoesNotExist("Failed to Authenticate Token") from err
+
+
 def authenticate_token(token):
     try:
         token_json = decrypt_token(token)
@@ -108,11 +165,9 @@ def authenticate_token(token):
 
 def create_friend_request(from_user_id, to_user_id) -> FriendRequest:
     try:
-        pending_request_exists = query.pending_friend_request_exists(from_user_id=from_user_id, to_user_id=to_user_id)
-        already_friends = query.are_friends(user_id_one=from_user_id, user_id_two=to_user_id)
-        user_not_searchable = not query.get_privacies(to_user_id).is_searchable
+        eligibility = query.get_friend_request_eligibility(from_user_id=from_user_id, to_user_id=to_user_id)
 
-        if pending_request_exists or already_friends or user_not_searchable:
+        if eligibility["pending_request"] or eligibility["already_friends"] or not eligibility["is_searchable"]:
             raise ValueError("Unable to Create Friend Request")
 
         return query.create_friend_request(from_user_id, to_user_id)
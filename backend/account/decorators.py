@@ -1,7 +1,6 @@
-from django.http import JsonResponse
-
 import account.business as business
 import jamco.helper as helper
+from jamco.helper import JsonResponse
 
 
 def requires_login(allow_friends=False, check_field="user_id"):
@@ -10,14 +9,14 @@ def requires_login(allow_friends=False, check_field="user_id"):
             if request.COOKIES.get("auth_token"):
                 token = request.COOKIES.get("auth_token")
                 try:
-                    user = business.validate_token(token)
+                    user = business.validate_token_cached(token)
                     request.user = user
                     body = helper.read_request(request)
                     if check_field is not None and body.get(check_field) != user.id:
                         if not allow_friends:
                             return JsonResponse({}, status=401)
                         else:
-                            if not user.friends.filter(id=body.get(check_field)).exists():
+                            if not business.are_friends(user.id, body.get(check_field)):
                                 return JsonResponse({}, status=401)
                     return wrapped_view(request, *args, **kwargs)
                 except Exception:
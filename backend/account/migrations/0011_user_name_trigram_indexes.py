@@ -0,0 +1,35 @@
+from django.db import migrations
+
+# Trigram indexes backing the icontains filters in query.search_searchable_users.
+# They are Postgres-only (pg_trgm); other backends (e.g. sqlite) skip them.
+CREATE_SQL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS account_user_first_name_trgm "
+    "ON account_user USING gin (UPPER(first_name::text) gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS account_user_last_name_trgm "
+    "ON account_user USING gin (UPPER(last_name::text) gin_trgm_ops)",
+]
+DROP_SQL = [
+    "DROP INDEX IF EXISTS account_user_first_name_trgm",
+    "DROP INDEX IF EXISTS account_user_last_name_trgm",
+]
+
+
+def _run_on_postgres(statements):
+    def _run(apps, schema_editor):
+        if schema_editor.connection.vendor != "postgresql":
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+
+    return _run
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("account", "0010_alter_user_city_alter_user_country_and_more"),
+    ]
+
+    operations = [
+        migrations.RunPython(_run_on_postgres(CREATE_SQL), _run_on_postgres(DROP_SQL)),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.1.5 on 2026-10-18 14:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("account", "0011_user_name_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="friendrequest",
+            index=models.Index(
+                fields=["from_user", "to_user", "acknowledged"],
+                name="friendrequest_pair_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 4.1.5 on 2026-10-18 14:18
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("account", "0012_friendrequest_pair_index"),
+    ]
+
+    operations = [
+        # from_user lookups are served by friendrequest_pair_idx
+        migrations.AlterField(
+            model_name="friendrequest",
+            name="from_user",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="request_sender",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="friendrequest",
+            index=models.Index(
+                condition=models.Q(("acknowledged", None)),
+                fields=["to_user"],
+                name="friendrequest_pending_to_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="privacy",
+            index=models.Index(
+                condition=models.Q(("is_searchable", True)),
+                fields=["user"],
+                name="privacy_searchable_idx",
+            ),
+        ),
+    ]
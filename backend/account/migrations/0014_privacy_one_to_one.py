@@ -0,0 +1,27 @@
+# Generated by Django 4.1.5 on 2026-10-18 14:19
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def remove_duplicate_privacies(apps, schema_editor):
+    # Keep each user's oldest privacy row so the unique constraint can be added
+    Privacy = apps.get_model("account", "Privacy")
+    first_ids = Privacy.objects.values("user_id").annotate(first_id=models.Min("id")).values_list("first_id", flat=True)
+    Privacy.objects.exclude(id__in=list(first_ids)).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("account", "0013_hot_filter_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_privacies, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="privacy",
+            name="user",
+            field=models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+    ]
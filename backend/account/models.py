@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import Q
 from django.contrib.auth.models import AbstractUser
 from datetime import datetime
 
@@ -15,6 +16,29 @@ class User(AbstractUser):
     friends = models.ManyToManyField("self")
 
     def to_dict(self):
+        # Pending requests in both directions come back from a single query, so the whole
+        # payload costs two queries (friends + pending requests) regardless of the user
+        pending_requests = (
+            FriendRequest.objects.filter(Q(from_user_id=self.id) | Q(to_user_id=self.id), acknowledged=None)
+            .order_by("id")
+            .values(
+                "id",
+                "from_user_id",
+                "to_user_id",
+                "from_user__first_name",
+                "from_user__last_name",
+                "from_user__country",
+            )
+        )
+        sent_requests = []
+        received_requests = []
+        for req in pending_requests:
+            if req["from_user_id"] == self.id:
+                sent_requests.append(req["to_user_id"])
+            if req["to_user_id"] == self.id:
+                del req["to_user_id"]
+                received_requests.append(req)
+
         return {
             "id": self.id,
             "google_id": self.google_id,
@@ -29,23 +53,23 @@ class User(AbstractUser):
             "birthday": self.birthday,
             "field_of_work": self.field_of_work,
             "friends": list(self.friends.values("id", "first_name", "last_name", "country")),
-            "sent_friend_requests": list(
-                self.request_sender.filter(acknowledged=None).values_list("to_user_id", flat=True)
-            ),
-            "received_friend_requests": list(
-                self.request_receiver.filter(acknowledged=None).values(
-                    "id", "from_user_id", "from_user__first_name", "from_user__last_name", "from_user__country"
-                )
-            ),
+            "sent_friend_requests": sent_requests,
+            "received_friend_requests": received_requests,
         }
 
 
 class Privacy(models.Model):
-    user = models.ForeignKey(User, on_delete=models.CASCADE, null=False)
+    user = models.OneToOneField(User, on_delete=models.CASCADE, null=False)
     is_searchable = models.BooleanField(null=False)
     share_kanban = models.BooleanField(null=False)
     cover_letter_requestable = models.BooleanField(null=False)
 
+    class Meta:
+        indexes = [
+            # Only searchable users are ever looked up by name
+            models.Index(fields=["user"], condition=Q(is_searchable=True), name="privacy_searchable_idx"),
+        ]
+
     def to_dict(self):
         return {
             "id": self.id,
@@ -56,12 +80,23 @@ class Privacy(models.Model):
 
 
 class FriendRequest(models.Model):
-    from_user = models.ForeignKey(User, on_delete=models.CASCADE, null=False, related_name="request_sender")
+    # from_user lookups are served by friendrequest_pair_idx, so it doesn't need an index of its own
+    from_user = models.ForeignKey(
+        User, on_delete=models.CASCADE, null=False, related_name="request_sender", db_index=False
+    )
     to_user = models.ForeignKey(User, on_delete=models.CASCADE, null=False, related_name="request_receiver")
     sent = models.DateTimeField(verbose_name="Timestamp when request sent", null=False)
     accepted = models.BooleanField(default=False, null=False)
     acknowledged = models.DateTimeField(null=True, default=None)
 
+    class Meta:
+        indexes = [
+            # Backs the pending request lookups between two users, and every other lookup by from_user
+            models.Index(fields=["from_user", "to_user", "acknowledged"], name="friendrequest_pair_idx"),
+            # User.to_dict only reads unacknowledged requests, the received ones by to_user
+            models.Index(fields=["to_user"], condition=Q(acknowledged=None), name="friendrequest_pending_to_idx"),
+        ]
+
     def to_dict(self):
         return {
             "from_user_id": self.from_user.id,
@@ -70,3 +105,10 @@ class FriendRequest(models.Model):
             "accepted": self.accepted,
             "acknowledged": self.acknowledged,
         }
+
+
+class AccountVersion(models.Model):
+    # Bumped whenever anything in the user's account data changes: their own row, their privacies, their friends and
+    # friend requests, or the name of a friend or pending request sender. It versions the ETags of the account reads.
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True)
+    version = models.PositiveBigIntegerField(default=0)
@@ -5,18 +5,21 @@ Query functions for account related operations.
 """
 
 from django.core.exceptions import ObjectDoesNotExist
-from django.db.models import QuerySet
+from django.db.models import Case, CharField, Exists, F, IntegerField, OuterRef, Q, QuerySet, Value, When
+from django.db.models.functions import Coalesce, Concat, Lower
 from django.utils import timezone
-from account.models import User, Privacy, FriendRequest
+from typing import Optional, Tuple
+from account.models import AccountVersion, User, Privacy, FriendRequest
+from jamco import cache as user_cache
 
 
-def get_or_create_user(payload: dict) -> User:
+def get_or_create_user(payload: dict) -> Tuple[User, bool]:
     try:
         user = User.objects.get(google_id=payload["sub"])
         update_user_last_login(user)
-        return user
+        return user, False
     except ObjectDoesNotExist:
-        return User.objects.create(
+        user = User.objects.create(
             username=payload["sub"],
             google_id=payload["sub"],
             email=payload["email"] if payload.get("email") else "",
@@ -25,15 +28,13 @@ def get_or_create_user(payload: dict) -> User:
             last_name=payload.get("family_name") if payload.get("family_name") else "",
             last_login=timezone.now(),
         )
-
-
-def user_exists(google_id: str) -> bool:
-    return User.objects.filter(google_id=google_id).exists()
+        return user, True
 
 
 def update_user(payload: dict):
     # updates based on user_id rather than google_id
     user = User.objects.get(id=payload.get("id"))
+    google_id = user.google_id
     for key, value in payload.items():
         # If there are invalid keys in the payload (e.g. the frontend misspelled
         # the name of a field), raise an exception
@@ -49,23 +50,31 @@ def update_user(payload: dict):
     # isn't raised. That is, we'll only save changes if the entire payload is
     # error-free.
     user.save()
+    user_cache.invalidate(user_cache.TOKEN_USERS, google_id)
+    # The user's name and country are also part of their friends' data, and of the requests they have pending
+    pending_to_ids = FriendRequest.objects.filter(from_user_id=user.id, acknowledged=None).values_list(
+        "to_user_id", flat=True
+    )
+    bump_versions(user.id, *get_friend_ids(user.id), *pending_to_ids)
 
 
 def create_privacies(in_user_id):
     Privacy.objects.create(
-        user=User.objects.get(id=in_user_id),
+        user_id=in_user_id,
         is_searchable=True,
         share_kanban=True,
         cover_letter_requestable=True,
     )
+    # Only created along with a new user, so there's no versioned data to retire yet
+    user_cache.invalidate(user_cache.PRIVACIES, in_user_id)
 
 
 def get_privacies(in_user_id) -> Privacy:
-    return Privacy.objects.get(user__id=in_user_id)
+    return Privacy.objects.get(user_id=in_user_id)
 
 
 def update_privacies(in_user_id, payload: dict):
-    privacies = Privacy.objects.get(user__id=in_user_id)
+    privacies = Privacy.objects.get(user_id=in_user_id)
     for key, value in payload.items():
         # If there are invalid keys in the payload, raise an exception
         if hasattr(privacies, key):
@@ -75,6 +84,8 @@ def update_privacies(in_user_id, payload: dict):
 
     # Will only execute if an exception isn't raised
     privacies.save()
+    user_cache.invalidate(user_cache.PRIVACIES, in_user_id)
+    bump_versions(in_user_id)
 
 
 def add_friend(user1_id, user2_id):
@@ -82,6 +93,8 @@ def add_friend(user1_id, user2_id):
     user2 = User.objects.get(id=user2_id)
 
     user1.friends.add(user2)
+    _invalidate_friend_ids(user1_id, user2_id)
+    bump_versions(user1_id, user2_id)
 
 
 def remove_friend(user1_id, user2_id):
@@ -89,6 +102,24 @@ def remove_friend(user1_id, user2_id):
     user2 = User.objects.get(id=user2_id)
 
     user1.friends.remove(user2)
+    _invalidate_friend_ids(user1_id, user2_id)
+    bump_versions(user1_id, user2_id)
+
+
+def get_friend_ids(user_id) -> frozenset:
+    # Kept in the shared user cache, so a friendship change is seen by every worker
+    return user_cache.get_or_load(
+        user_cache.FRIEND_IDS,
+        user_id,
+        lambda: frozenset(
+            User.friends.through.objects.filter(from_user_id=user_id).values_list("to_user_id", flat=True)
+        ),
+    )
+
+
+def _invalidate_friend_ids(*user_ids) -> None:
+    for user_id in user_ids:
+        user_cache.invalidate(user_cache.FRIEND_IDS, user_id)
 
 
 # only to be used when loading a friend's info.
@@ -111,23 +142,71 @@ def get_user_by_token_fields_noupdate(google_id, last_login) -> User:
     return user
 
 
+def get_user_by_token_fields_cached(google_id, last_login) -> User:
+    # The user's row is cached by google_id and retired whenever it changes, so a token issued for an
+    # older last_login stops matching on every worker as soon as the login is rotated
+    user = user_cache.get_or_load(user_cache.TOKEN_USERS, google_id, lambda: User.objects.get(google_id=google_id))
+    if user.last_login != last_login:
+        raise User.DoesNotExist("User matching query does not exist.")
+    return user
+
+
+def get_user_version_by_token_fields(google_id, last_login) -> Optional[Tuple[int, int]]:
+    # A single indexed lookup, returning None when the token's last_login is no longer current
+    return (
+        User.objects.filter(google_id=google_id, last_login=last_login)
+        .values_list("id", Coalesce("accountversion__version", 0))
+        .first()
+    )
+
+
 def update_user_last_login(user) -> None:
     user.last_login = timezone.now()
     user.save(update_fields=["last_login"])
+    user_cache.invalidate(user_cache.TOKEN_USERS, user.google_id)
 
 
 def get_all_searchable() -> QuerySet(User):
-    return User.objects.filter(id__in=Privacy.objects.filter(is_searchable=True).values_list("user__id", flat=True))
+    return User.objects.filter(privacy__is_searchable=True)
+
+
+def search_searchable_users(tokens: list[str], limit: int, after: tuple[int, int] = None) -> QuerySet(User):
+    # Every token must appear in either the first or last name.
+    # On postgres, the icontains lookups are served by the trigram indexes on the name columns
+    users = get_all_searchable().only("id", "first_name", "last_name", "country")
+    word_prefix = Q()
+    for tok in tokens:
+        users = users.filter(Q(first_name__icontains=tok) | Q(last_name__icontains=tok))
+        word_prefix &= Q(first_name__istartswith=tok) | Q(last_name__istartswith=tok)
+
+    # rank 0: full name starts with the search, 1: every token starts a name, 2: substring match
+    users = users.annotate(
+        full_name=Concat(Lower("first_name"), Value(" "), Lower("last_name"), output_field=CharField())
+    ).annotate(
+        rank=Case(
+            When(full_name__startswith=" ".join(tokens), then=Value(0)),
+            When(word_prefix, then=Value(1)),
+            default=Value(2),
+            output_field=IntegerField(),
+        )
+    )
+    # keyset pagination on (rank, id), after is the last (rank, id) the client has seen
+    if after is not None:
+        after_rank, after_id = after
+        users = users.filter(Q(rank__gt=after_rank) | Q(rank=after_rank, id__gt=after_id))
+    return users.order_by("rank", "id")[:limit]
 
 
 def create_friend_request(from_user_id, to_user_id) -> FriendRequest:
-    return FriendRequest.objects.create(
+    request = FriendRequest.objects.create(
         from_user=User.objects.get(id=from_user_id),
         to_user=User.objects.get(id=to_user_id),
         sent=timezone.now(),
         accepted=False,
         acknowledged=None,
     )
+    bump_versions(from_user_id, to_user_id)
+    return request
 
 
 def accept_friend_request(request_id, to_user_id, from_user_id) -> None:
@@ -135,12 +214,14 @@ def accept_friend_request(request_id, to_user_id, from_user_id) -> None:
     request.accepted = True
     request.acknowledged = timezone.now()
     request.save()
+    bump_versions(to_user_id, from_user_id)
 
 
 def deny_friend_request(request_id, to_user_id, from_user_id) -> None:
     request = FriendRequest.objects.get(id=request_id, to_user__id=to_user_id, from_user_id=from_user_id)
     request.acknowledged = timezone.now()
     request.save()
+    bump_versions(to_user_id, from_user_id)
 
 
 def get_friend_requests_status(user_id) -> list[QuerySet, QuerySet]:
@@ -158,13 +239,66 @@ def pending_friend_request_exists(from_user_id, to_user_id, request_id=None) ->
         return FriendRequest.objects.filter(
             id=request_id, to_user__id=to_user_id, from_user_id=from_user_id, acknowledged=None
         ).exists()
-    return (
-        FriendRequest.objects.filter(from_user__id=from_user_id, to_user__id=to_user_id, acknowledged=None).exists()
-        or FriendRequest.objects.filter(from_user__id=to_user_id, to_user__id=from_user_id, acknowledged=None).exists()
+    return _pending_between(from_user_id, to_user_id).exists()
+
+
+def _pending_between(user_id_one, user_id_two) -> QuerySet(FriendRequest):
+    # Both directions are (from_user, to_user) equality lookups, so each is served by the
+    # (from_user, to_user, acknowledged) index
+    return FriendRequest.objects.filter(
+        Q(from_user_id=user_id_one, to_user_id=user_id_two) | Q(from_user_id=user_id_two, to_user_id=user_id_one),
+        acknowledged=None,
     )
 
 
+def get_friend_request_eligibility(from_user_id, to_user_id) -> dict:
+    """
+    Returns whether a request is already pending between the users, whether they're already friends,
+    and whether the receiver is searchable, all in a single query.
+    Raises ObjectDoesNotExist if either user doesn't exist.
+    """
+    eligibility = (
+        User.objects.filter(id=to_user_id)
+        .annotate(
+            sender_exists=Exists(User.objects.filter(id=from_user_id)),
+            pending_request=Exists(_pending_between(from_user_id, OuterRef("id"))),
+            already_friends=Exists(
+                User.friends.through.objects.filter(from_user_id=OuterRef("id"), to_user_id=from_user_id)
+            ),
+            is_searchable=Coalesce("privacy__is_searchable", False),
+        )
+        .values("sender_exists", "pending_request", "already_friends", "is_searchable")
+        .first()
+    )
+    if eligibility is None or not eligibility.pop("sender_exists"):
+        raise ObjectDoesNotExist("User does not exist")
+    return eligibility
+
+
 def are_friends(user_id_one, user_id_two) -> bool:
-    user_one = User.objects.get(id=user_id_one)
-    user_two = User.objects.get(id=user_id_two)
-    return user_one.friends.contains(user_two)
+    # Ids can come straight from a request body (e.g. as strings), so they're converted like a pk lookup would,
+    # raising ValueError for anything that isn't an id
+    user_id_one, user_id_two = User._meta.pk.get_prep_value(user_id_one), User._meta.pk.get_prep_value(user_id_two)
+    # friends is symmetrical, so one side's friend ids is enough
+    if user_id_two in get_friend_ids(user_id_one):
+        return True
+    # Only friends can be answered from the cache, anything else has to check both users exist
+    if User.objects.filter(id__in=(user_id_one, user_id_two)).count() < len({user_id_one, user_id_two}):
+        raise User.DoesNotExist("User matching query does not exist.")
+    return False
+
+
+def bump_versions(*user_ids) -> None:
+    # Version rows are created on a user's first change. Missing ones are inserted at 0 (a concurrent insert for the
+    # same user is ignored) before the increment, so concurrent changes never share a version.
+    user_ids = set(user_ids)
+    existing = set(AccountVersion.objects.filter(user_id__in=user_ids).values_list("user_id", flat=True))
+    if user_ids - existing:
+        AccountVersion.objects.bulk_create(
+            [AccountVersion(user_id=user_id) for user_id in user_ids - existing], ignore_conflicts=True
+        )
+    AccountVersion.objects.filter(user_id__in=user_ids).update(version=F("version") + 1)
+
+
+def get_version(user_id) -> int:
+    return AccountVersion.objects.filter(user_id=user_id).values_list("version", flat=True).first() or 0
@@ -2,6 +2,8 @@
 # Add it to one of your django apps (/appdir/templatetags/render_vite_bundle.py, for example)
 
 import json
+import os
+import time
 
 from django import template
 from django.conf import settings
@@ -9,19 +11,18 @@ from django.utils.safestring import mark_safe
 
 register = template.Library()
 
+# How often (in seconds) the manifest's mtime is checked for a new build
+MANIFEST_CHECK_INTERVAL = 5
 
-@register.simple_tag
-def render_vite_bundle():
-    """
-    Template tag to render a vite bundle.
-    Supposed to only be used in production.
-    For development, see other files.
-    """
-    if not settings.PROD:
-        return
-    fd = open(f"{settings.VITE_APP_DIR}/dist/manifest.json", "r")
-    manifest = json.load(fd)
+# (manifest mtime, time of the last mtime check, rendered tags)
+_bundle_cache = (None, 0.0, None)
+
+
+def _manifest_path() -> str:
+    return f"{settings.VITE_APP_DIR}/dist/manifest.json"
 
+
+def _render_tags(manifest: dict) -> str:
     imports_files = "".join(
         [
             f'<script type="module" src="/static/dist/{manifest[file]["file"]}"></script>'
@@ -34,3 +35,35 @@ def render_vite_bundle():
         <link rel="stylesheet" type="text/css" href="/static/dist/{manifest['src/main.js']['css'][0]}" />
         {imports_files}"""
     )
+
+
+def _get_bundle_tags() -> str:
+    """
+    Returns the rendered tags for the current manifest.
+    The manifest is only re-read when its mtime changes, which is checked at most every MANIFEST_CHECK_INTERVAL.
+    """
+    global _bundle_cache
+    mtime, checked_at, tags = _bundle_cache
+    now = time.monotonic()
+    if tags is not None and now - checked_at < MANIFEST_CHECK_INTERVAL:
+        return tags
+
+    path = _manifest_path()
+    current_mtime = os.stat(path).st_mtime_ns
+    if tags is None or current_mtime != mtime:
+        with open(path, "r") as fd:
+            tags = _render_tags(json.load(fd))
+    _bundle_cache = (current_mtime, now, tags)
+    return tags
+
+
+@register.simple_tag
+def render_vite_bundle():
+    """
+    Template tag to render a vite bundle.
+    Supposed to only be used in production.
+    For development, see other files.
+    """
+    if not settings.PROD:
+        return
+    return _get_bundle_tags()
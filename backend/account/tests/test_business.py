@@ -1,22 +1,22 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
+from django.core.cache import cache
 from account import business
-from account.models import User
+from account.models import User, Privacy
 from unittest.mock import patch
 from account.tests.factories import UserFactory, PrivacyFactory, FriendRequestFactory
 from django.core.exceptions import ObjectDoesNotExist
+from account.auth_utils import encrypt_token, clear_token_fields_cache
+from account import query
+from django.utils import timezone
 
 
 @patch("account.business.encrypt_token")
 @patch("account.query.get_or_create_user")
-@patch("account.query.user_exists")
 @patch("account.business.create_default_columns")
 class GetOrCreateUserTests(TestCase):
-    def test_get_or_create_user_new(
-        self, mock_create_default_columns, mock_user_exists, mock_get_or_create_user, mock_encrypt_token
-    ):
+    def test_get_or_create_user_new(self, mock_create_default_columns, mock_get_or_create_user, mock_encrypt_token):
         mocked_user = UserFactory()
-        mock_get_or_create_user.return_value = mocked_user
-        mock_user_exists.return_value = False
+        mock_get_or_create_user.return_value = mocked_user, True
         mock_encrypt_token.return_value = "encrypted_token"
 
         user, token = business.get_or_create_user({"sub": mocked_user.google_id})
@@ -27,11 +27,10 @@ class GetOrCreateUserTests(TestCase):
         mock_create_default_columns.assert_called_with(mocked_user.id)
 
     def test_get_or_create_user_existing(
-        self, mock_create_default_columns, mock_user_exists, mock_get_or_create_user, mock_encrypt_token
+        self, mock_create_default_columns, mock_get_or_create_user, mock_encrypt_token
     ):
         mocked_user = UserFactory()
-        mock_get_or_create_user.return_value = mocked_user
-        mock_user_exists.return_value = True
+        mock_get_or_create_user.return_value = mocked_user, False
         mock_encrypt_token.return_value = "encrypted_token"
 
         user, token = business.get_or_create_user({"sub": mocked_user.google_id})
@@ -42,6 +41,22 @@ class GetOrCreateUserTests(TestCase):
         mock_create_default_columns.assert_not_called()
 
 
+class GetOrCreateUserQueryCountTests(TestCase):
+    def test_new_user_query_budget(self):
+        # user lookup, user insert, one bulk column insert and the privacy insert (plus the transaction's savepoint)
+        with self.assertNumQueries(6):
+            user, _ = business.get_or_create_user({"sub": "new-user", "email": "new@example.com"})
+        self.assertEqual(user.kanbancolumn_set.count(), 4)
+        self.assertTrue(Privacy.objects.filter(user=user).exists())
+
+    def test_existing_user_query_budget(self):
+        user = UserFactory()
+        # user lookup and the last_login update
+        with self.assertNumQueries(4):
+            business.get_or_create_user({"sub": user.google_id})
+        self.assertEqual(user.kanbancolumn_set.count(), 0)
+
+
 @patch("account.query.update_user")
 class UpdateUserTests(TestCase):
     def test_update_user_valid_birthday(self, mock_update_user):
@@ -151,14 +166,14 @@ class SearchTests(TestCase):
         mock_search_users_by_name.return_value = User.objects.all()
 
         # Make sure empty/whitespace strings don't return all users
-        results = business.search_users_by_name("  ")
+        results, next_cursor = business.search_users_by_name("  ")
         self.assertEqual(len(results), 0)
 
         expected_results = [
             {"id": u1.id, "first_name": u1.first_name, "last_name": u1.last_name, "country": None},
         ]
 
-        results = business.search_users_by_name(f"{u1.first_name} {u1.last_name}")
+        results, next_cursor = business.search_users_by_name(f"{u1.first_name} {u1.last_name}")
         self.assertEqual(expected_results, results)
 
         # Create similar names
@@ -178,14 +193,60 @@ class SearchTests(TestCase):
         # Update the return value
         mock_search_users_by_name.return_value = User.objects.all()
 
-        results = business.search_users_by_name("moth")
+        results, next_cursor = business.search_users_by_name("moth")
         self.assertEqual(len(results), 2)
         self.assertEqual(expected_results, results)
 
         # Make sure all tokens are validated as being in the same name
-        results = business.search_users_by_name(f"{u1.first_name} {u2.first_name}")
+        results, next_cursor = business.search_users_by_name(f"{u1.first_name} {u2.first_name}")
         self.assertEqual(len(results), 0)
 
+    @patch("account.business.SEARCH_RESULT_LIMIT", 2)
+    def test_searching_users_limit(self):
+        for _ in range(3):
+            PrivacyFactory(user=UserFactory(first_name="Same", last_name="Name"))
+
+        results, next_cursor = business.search_users_by_name("same")
+        self.assertEqual(len(results), 2)
+        self.assertIsNotNone(next_cursor)
+
+    def test_searching_users_ranking(self):
+        substring = UserFactory(first_name="Tim", last_name="Husam")
+        word_prefix = UserFactory(first_name="Bo", last_name="Sampson")
+        exact_prefix = UserFactory(first_name="Sam", last_name="Smith")
+        for user in (substring, word_prefix, exact_prefix):
+            PrivacyFactory(user=user)
+
+        results, next_cursor = business.search_users_by_name("sam")
+        self.assertEqual([res["id"] for res in results], [exact_prefix.id, word_prefix.id, substring.id])
+        self.assertIsNone(next_cursor)
+
+        # A whole-name prefix beats users that only match every token as a word prefix
+        results, next_cursor = business.search_users_by_name("sam s")
+        self.assertEqual([res["id"] for res in results], [exact_prefix.id, word_prefix.id, substring.id])
+
+    def test_searching_users_pagination(self):
+        users = [UserFactory(first_name="Page", last_name=f"Person{i}") for i in range(5)]
+        for user in users:
+            PrivacyFactory(user=user)
+
+        seen = []
+        results, next_cursor = business.search_users_by_name("page", limit=2)
+        seen += [res["id"] for res in results]
+        while next_cursor:
+            self.assertEqual(len(results), 2)
+            results, next_cursor = business.search_users_by_name("page", limit=2, cursor=next_cursor)
+            seen += [res["id"] for res in results]
+
+        # Every user shows up exactly once across the pages
+        self.assertEqual(seen, [user.id for user in users])
+
+    def test_searching_users_invalid_cursor(self):
+        with self.assertRaises(ValueError):
+            business.search_users_by_name("page", cursor="not a cursor")
+        with self.assertRaises(ValueError):
+            business.search_users_by_name("page", cursor=5)
+
 
 @patch("account.query.get_user_by_token_fields_noupdate")
 @patch("account.query.get_user_by_token_fields")
@@ -247,68 +308,89 @@ class AuthenticateTokenTests(TestCase):
             business.validate_token(invalid_token)
 
 
-@patch("account.query.pending_friend_request_exists")
-@patch("account.query.are_friends")
-@patch("account.query.get_privacies")
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class ValidateTokenCachedTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        clear_token_fields_cache()
+        self.user = UserFactory(last_login=timezone.now())
+        self.token = encrypt_token(self.user.google_id, self.user.last_login)
+
+    def test_validate_token_cached(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(business.validate_token_cached(self.token), self.user)
+        # The second call is answered from the cache
+        with self.assertNumQueries(0):
+            self.assertEqual(business.validate_token_cached(self.token), self.user)
+
+    def test_validate_token_cached_rotated(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            business.validate_token_cached(self.token)
+            query.update_user_last_login(self.user)
+
+        # The old token stops matching once the login is rotated
+        with self.assertRaises(ObjectDoesNotExist):
+            business.validate_token_cached(self.token)
+        new_token = encrypt_token(self.user.google_id, self.user.last_login)
+        self.assertEqual(business.validate_token_cached(new_token), self.user)
+
+    def test_validate_token_cached_invalid(self):
+        with self.assertRaises(ObjectDoesNotExist):
+            business.validate_token_cached(encrypt_token("gid", self.user.last_login))
+
+
+def _eligibility(pending_request=False, already_friends=False, is_searchable=True):
+    return {"pending_request": pending_request, "already_friends": already_friends, "is_searchable": is_searchable}
+
+
+@patch("account.query.get_friend_request_eligibility")
 @patch("account.query.create_friend_request")
 class CreateFriendRequestTests(TestCase):
-    def test_create_friend_request_valid(
-        self, mock_create_friend_request, mock_get_privacies, mock_are_friends, mock_pending_friend_request_exists
-    ):
+    def test_create_friend_request_valid(self, mock_create_friend_request, mock_get_friend_request_eligibility):
         req = FriendRequestFactory()
         mock_create_friend_request.return_value = req
-        mock_are_friends.return_value = False
-        mock_get_privacies.return_value = PrivacyFactory(is_searchable=True)
-        mock_pending_friend_request_exists.return_value = False
+        mock_get_friend_request_eligibility.return_value = _eligibility()
 
         self.assertEqual(business.create_friend_request(req.from_user.id, req.to_user.id).to_dict(), req.to_dict())
 
     def test_create_friend_pending_request_exists(
-        self, mock_create_friend_request, mock_get_privacies, mock_are_friends, mock_pending_friend_request_exists
+        self, mock_create_friend_request, mock_get_friend_request_eligibility
     ):
         req = FriendRequestFactory()
         mock_create_friend_request.return_value = req
-        mock_are_friends.return_value = False
-        mock_get_privacies.return_value = PrivacyFactory(is_searchable=True)
-        mock_pending_friend_request_exists.return_value = True
+        mock_get_friend_request_eligibility.return_value = _eligibility(pending_request=True)
 
         with self.assertRaises(ValueError):
             business.create_friend_request(req.from_user.id, req.to_user.id)
 
     def test_create_friend_request_already_friends(
-        self, mock_create_friend_request, mock_get_privacies, mock_are_friends, mock_pending_friend_request_exists
+        self, mock_create_friend_request, mock_get_friend_request_eligibility
     ):
         req = FriendRequestFactory()
         mock_create_friend_request.return_value = req
-        mock_are_friends.return_value = True
-        mock_get_privacies.return_value = PrivacyFactory(is_searchable=True)
-        mock_pending_friend_request_exists.return_value = False
+        mock_get_friend_request_eligibility.return_value = _eligibility(already_friends=True)
 
         with self.assertRaises(ValueError):
             business.create_friend_request(req.from_user.id, req.to_user.id)
         mock_create_friend_request.assert_not_called()
 
     def test_create_friend_request_user_not_searchable(
-        self, mock_create_friend_request, mock_get_privacies, mock_are_friends, mock_pending_friend_request_exists
+        self, mock_create_friend_request, mock_get_friend_request_eligibility
     ):
         req = FriendRequestFactory()
         mock_create_friend_request.return_value = req
-        mock_are_friends.return_value = False
-        mock_get_privacies.return_value = PrivacyFactory(is_searchable=False)
-        mock_pending_friend_request_exists.return_value = False
+        mock_get_friend_request_eligibility.return_value = _eligibility(is_searchable=False)
 
         with self.assertRaises(ValueError):
             business.create_friend_request(req.from_user.id, req.to_user.id)
         mock_create_friend_request.assert_not_called()
 
     def test_create_friend_request_sub_search_error(
-        self, mock_create_friend_request, mock_get_privacies, mock_are_friends, mock_pending_friend_request_exists
+        self, mock_create_friend_request, mock_get_friend_request_eligibility
     ):
         req = FriendRequestFactory()
         mock_create_friend_request.return_value = req
-        mock_are_friends.side_effect = ObjectDoesNotExist
-        mock_get_privacies.return_value = PrivacyFactory(is_searchable=False)
-        mock_pending_friend_request_exists.return_value = False
+        mock_get_friend_request_eligibility.side_effect = ObjectDoesNotExist
 
         with self.assertRaises(ObjectDoesNotExist):
             business.create_friend_request(req.from_user.id, req.to_user.id)
@@ -1,7 +1,12 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
+from django.core.cache import cache
+from django.core.cache.backends.filebased import FileBasedCache
 from django.core.exceptions import ObjectDoesNotExist
+from unittest.mock import patch
+import tempfile
 from account import query, models
 from account.tests.factories import UserFactory, PrivacyFactory, FriendRequestFactory
+from django.db import IntegrityError
 from django.utils import timezone
 from datetime import datetime
 
@@ -9,13 +14,15 @@ from datetime import datetime
 class GetOrCreateUserTests(TestCase):
     def test_create_and_get_account(self):
         # 'sub' is the field name from google tokens
-        query.get_or_create_user({"sub": "4"})
+        _, created = query.get_or_create_user({"sub": "4"})
         # A user should exist after that query
+        self.assertTrue(created)
         self.assertTrue(models.User.objects.filter(google_id="4").exists())
 
         # Repeating the query should result in retrieving the user, not creating
         # another one
-        query.get_or_create_user({"sub": "4"})
+        _, created = query.get_or_create_user({"sub": "4"})
+        self.assertFalse(created)
         self.assertTrue(models.User.objects.filter(google_id="4").exists())
         self.assertEqual(models.User.objects.filter(google_id="4").count(), 1)
 
@@ -55,16 +62,71 @@ class GetOrCreateUserTests(TestCase):
         with self.assertRaises(ObjectDoesNotExist):
             query.get_friend_data(1)
 
-        user = query.get_or_create_user({"sub": "4"})
+        user, _ = query.get_or_create_user({"sub": "4"})
         test = query.get_friend_data(user.id)
         self.assertDictEqual(user.to_dict(), test.to_dict())
 
 
-class UserExistsTests(TestCase):
-    def test_user_exists(self):
-        self.assertFalse(query.user_exists("4"))
-        query.get_or_create_user({"sub": "4"})
-        self.assertTrue(query.user_exists("4"))
+class SearchSearchableUsersTests(TestCase):
+    def test_search_searchable_users(self):
+        u1 = PrivacyFactory(user=UserFactory(first_name="Timothy", last_name="Smith")).user
+        u2 = PrivacyFactory(user=UserFactory(first_name="Jimothy", last_name="Smithers")).user
+        PrivacyFactory(user=UserFactory(first_name="Butterfree", last_name="Ketchum"))
+        PrivacyFactory(user=UserFactory(first_name="Timothy", last_name="Hidden"), is_searchable=False)
+
+        self.assertEqual(list(query.search_searchable_users(["moth"], 10)), [u1, u2])
+        # Matching is case-insensitive
+        self.assertEqual(list(query.search_searchable_users(["MOTH"], 10)), [u1, u2])
+        # Every token has to match the first or last name
+        self.assertEqual(list(query.search_searchable_users(["moth", "smithers"], 10)), [u2])
+        self.assertEqual(list(query.search_searchable_users(["moth", "ketchum"], 10)), [])
+
+    def test_search_searchable_users_limit(self):
+        for _ in range(5):
+            PrivacyFactory(user=UserFactory(first_name="Same", last_name="Name"))
+        self.assertEqual(len(query.search_searchable_users(["same"], 3)), 3)
+
+
+class UserToDictTests(TestCase):
+    def test_to_dict_friend_requests(self):
+        user = UserFactory()
+        friend = UserFactory()
+        user.friends.add(friend)
+        sent = FriendRequestFactory(from_user=user)
+        received = FriendRequestFactory(to_user=user)
+        # Acknowledged requests aren't pending anymore
+        FriendRequestFactory(from_user=user, acknowledged=timezone.now())
+        FriendRequestFactory(to_user=user, acknowledged=timezone.now())
+
+        user_dict = user.to_dict()
+        self.assertEqual(
+            user_dict["friends"],
+            [{"id": friend.id, "first_name": friend.first_name, "last_name": friend.last_name, "country": None}],
+        )
+        self.assertEqual(user_dict["sent_friend_requests"], [sent.to_user.id])
+        self.assertEqual(
+            user_dict["received_friend_requests"],
+            [
+                {
+                    "id": received.id,
+                    "from_user_id": received.from_user.id,
+                    "from_user__first_name": received.from_user.first_name,
+                    "from_user__last_name": received.from_user.last_name,
+                    "from_user__country": None,
+                }
+            ],
+        )
+
+    def test_to_dict_query_count(self):
+        user = UserFactory()
+        for _ in range(3):
+            user.friends.add(UserFactory())
+            FriendRequestFactory(from_user=user)
+            FriendRequestFactory(to_user=user)
+
+        # friends + pending requests, no matter how many of either there are
+        with self.assertNumQueries(2):
+            user.to_dict()
 
 
 class UpdateAccountTests(TestCase):
@@ -103,6 +165,17 @@ class PrivacyTests(TestCase):
         query.create_privacies(user.id)
         self.assertEqual(models.Privacy.objects.count(), 1)
 
+    def test_one_privacy_per_user(self):
+        user = UserFactory()
+        query.create_privacies(user.id)
+        with self.assertRaises(IntegrityError):
+            query.create_privacies(user.id)
+
+    def test_get_all_searchable_joins(self):
+        PrivacyFactory()
+        # Searchable users are found with a join on privacy, not an IN subquery
+        self.assertNotIn("IN (SELECT", str(query.get_all_searchable().query))
+
     def test_get_privacies(self):
         priv = PrivacyFactory()
         user = priv.user
@@ -259,6 +332,79 @@ class GetUserByTokenFieldsTests(TestCase):
         self.assertEqual(user, retrieved_user)
 
 
+class AccountVersionTests(TestCase):
+    def setUp(self):
+        self.user = UserFactory()
+        self.other = UserFactory()
+
+    def assertBumped(self, *users):
+        for user in users:
+            self.assertEqual(query.get_version(user.id), self.versions[user.id] + 1)
+
+    def snapshot_versions(self):
+        self.versions = {user.id: query.get_version(user.id) for user in models.User.objects.all()}
+
+    def test_version_starts_at_zero(self):
+        self.assertEqual(query.get_version(self.user.id), 0)
+        query.bump_versions(self.user.id)
+        query.bump_versions(self.user.id, self.other.id)
+        self.assertEqual(query.get_version(self.user.id), 2)
+        self.assertEqual(query.get_version(self.other.id), 1)
+
+    def test_update_privacies_bumps_version(self):
+        PrivacyFactory(user=self.user)
+        self.snapshot_versions()
+        query.update_privacies(self.user.id, {"is_searchable": False})
+        self.assertBumped(self.user)
+        self.assertEqual(query.get_version(self.other.id), self.versions[self.other.id])
+
+    def test_friend_changes_bump_both_users(self):
+        self.snapshot_versions()
+        query.add_friend(self.user.id, self.other.id)
+        self.assertBumped(self.user, self.other)
+
+        self.snapshot_versions()
+        query.remove_friend(self.user.id, self.other.id)
+        self.assertBumped(self.user, self.other)
+
+    def test_friend_requests_bump_both_users(self):
+        self.snapshot_versions()
+        request = query.create_friend_request(self.user.id, self.other.id)
+        self.assertBumped(self.user, self.other)
+
+        self.snapshot_versions()
+        query.accept_friend_request(request.id, self.other.id, self.user.id)
+        self.assertBumped(self.user, self.other)
+
+        request = query.create_friend_request(self.other.id, self.user.id)
+        self.snapshot_versions()
+        query.deny_friend_request(request.id, self.user.id, self.other.id)
+        self.assertBumped(self.user, self.other)
+
+    def test_update_user_bumps_friends_and_pending_receivers(self):
+        friend, receiver, acknowledged, stranger = UserFactory.create_batch(4)
+        query.add_friend(self.user.id, friend.id)
+        FriendRequestFactory(from_user=self.user, to_user=receiver, acknowledged=None)
+        FriendRequestFactory(from_user=self.user, to_user=acknowledged, acknowledged=timezone.now())
+        self.snapshot_versions()
+
+        query.update_user({"id": self.user.id, "first_name": "Rob"})
+        # Their name shows up in the friend's friend list, and the receiver's received requests
+        self.assertBumped(self.user, friend, receiver)
+        self.assertEqual(query.get_version(acknowledged.id), self.versions[acknowledged.id])
+        self.assertEqual(query.get_version(stranger.id), self.versions[stranger.id])
+
+    def test_get_user_version_by_token_fields(self):
+        login = timezone.now()
+        user = UserFactory(last_login=login)
+        self.assertEqual(query.get_user_version_by_token_fields(user.google_id, login), (user.id, 0))
+        query.bump_versions(user.id)
+        with self.assertNumQueries(1):
+            self.assertEqual(query.get_user_version_by_token_fields(user.google_id, login), (user.id, 1))
+        query.update_user_last_login(user)
+        self.assertIsNone(query.get_user_version_by_token_fields(user.google_id, login))
+
+
 class UpdateLastUserLoginTest(TestCase):
     def test_update_last_user_login(self):
         prev_login = datetime.strptime("2023-03-03 01:28:02.710196+00:00", "%Y-%m-%d %H:%M:%S.%f%z")
@@ -359,6 +505,37 @@ class PendingFriendRequestExistsTest(TestCase):
         self.assertFalse(query.pending_friend_request_exists(to_user_id=req.to_user.id, from_user_id=req.from_user.id))
 
 
+class FriendRequestEligibilityTests(TestCase):
+    def test_eligible(self):
+        sender = UserFactory()
+        receiver = PrivacyFactory(is_searchable=True).user
+        with self.assertNumQueries(1):
+            eligibility = query.get_friend_request_eligibility(sender.id, receiver.id)
+        self.assertEqual(eligibility, {"pending_request": False, "already_friends": False, "is_searchable": True})
+
+    def test_ineligible(self):
+        sender = UserFactory()
+        receiver = PrivacyFactory(is_searchable=False).user
+        sender.friends.add(receiver)
+        # A pending request in either direction counts
+        FriendRequestFactory(from_user=receiver, to_user=sender, acknowledged=None)
+        eligibility = query.get_friend_request_eligibility(sender.id, receiver.id)
+        self.assertEqual(eligibility, {"pending_request": True, "already_friends": True, "is_searchable": False})
+
+    def test_acknowledged_request_not_pending(self):
+        sender = UserFactory()
+        receiver = PrivacyFactory(is_searchable=True).user
+        FriendRequestFactory(from_user=sender, to_user=receiver, acknowledged=timezone.now())
+        self.assertFalse(query.get_friend_request_eligibility(sender.id, receiver.id)["pending_request"])
+
+    def test_nonexistent_user(self):
+        user = PrivacyFactory().user
+        with self.assertRaises(ObjectDoesNotExist):
+            query.get_friend_request_eligibility(user.id, -1)
+        with self.assertRaises(ObjectDoesNotExist):
+            query.get_friend_request_eligibility(-1, user.id)
+
+
 class AreFriendsTest(TestCase):
     def test_are_friends_true(self):
         user_one = UserFactory()
@@ -373,3 +550,119 @@ class AreFriendsTest(TestCase):
         user_two = UserFactory()
         self.assertFalse(query.are_friends(user_one.id, user_two.id))
         self.assertFalse(query.are_friends(user_two.id, user_one.id))
+
+    def test_are_friends_string_ids(self):
+        user_one = UserFactory()
+        user_two = UserFactory()
+        user_one.friends.add(user_two)
+        self.assertTrue(query.are_friends(user_one.id, str(user_two.id)))
+        self.assertTrue(query.are_friends(str(user_two.id), user_one.id))
+        with self.assertRaises(ValueError):
+            query.are_friends(user_one.id, "not an id")
+
+    def test_are_friends_missing_user(self):
+        user = UserFactory()
+        with self.assertRaises(ObjectDoesNotExist):
+            query.are_friends(user.id, user.id + 1)
+        with self.assertRaises(ObjectDoesNotExist):
+            query.are_friends(user.id + 1, user.id)
+        with self.assertRaises(ObjectDoesNotExist):
+            query.are_friends(user.id, None)
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class CachedFriendIdsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user_one = UserFactory()
+        self.user_two = UserFactory()
+
+    def test_are_friends_cached(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertFalse(query.are_friends(self.user_one.id, self.user_two.id))
+        # Answered from the cached friend ids, only checking that the users exist
+        with self.assertNumQueries(1):
+            self.assertFalse(query.are_friends(self.user_one.id, self.user_two.id))
+
+        # Adding and removing friends retires both users' cached ids
+        with self.captureOnCommitCallbacks(execute=True):
+            query.add_friend(self.user_one.id, self.user_two.id)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertTrue(query.are_friends(self.user_one.id, self.user_two.id))
+        with self.assertNumQueries(0):
+            self.assertTrue(query.are_friends(self.user_one.id, self.user_two.id))
+        self.assertTrue(query.are_friends(self.user_two.id, self.user_one.id))
+        with self.captureOnCommitCallbacks(execute=True):
+            query.remove_friend(self.user_two.id, self.user_one.id)
+        self.assertFalse(query.are_friends(self.user_one.id, self.user_two.id))
+        self.assertFalse(query.are_friends(self.user_two.id, self.user_one.id))
+
+    def test_are_friends_not_cached_before_commit(self):
+        query.are_friends(self.user_one.id, self.user_two.id)
+        with self.assertNumQueries(2):
+            query.are_friends(self.user_one.id, self.user_two.id)
+
+    def test_friend_added_during_load(self):
+        # A reader loads the old friend ids, and only stores them after a friendship is added and committed
+        with self.captureOnCommitCallbacks() as reader_callbacks:
+            self.assertFalse(query.are_friends(self.user_one.id, self.user_two.id))
+        with self.captureOnCommitCallbacks(execute=True):
+            query.add_friend(self.user_one.id, self.user_two.id)
+        for callback in reader_callbacks:
+            callback()
+        # The old ids were stored under a retired generation
+        self.assertTrue(query.are_friends(self.user_one.id, self.user_two.id))
+
+    def test_friend_removed_on_another_worker(self):
+        # Two workers' instances of a shared backend
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        worker_a, worker_b = FileBasedCache(directory.name, {}), FileBasedCache(directory.name, {})
+        query.add_friend(self.user_one.id, self.user_two.id)
+
+        with patch("jamco.cache.cache", worker_a), self.captureOnCommitCallbacks(execute=True):
+            self.assertTrue(query.are_friends(self.user_two.id, self.user_one.id))
+        with patch("jamco.cache.cache", worker_b), self.captureOnCommitCallbacks(execute=True):
+            query.remove_friend(self.user_one.id, self.user_two.id)
+        with patch("jamco.cache.cache", worker_a):
+            self.assertFalse(query.are_friends(self.user_two.id, self.user_one.id))
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class CachedTokenUserTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = UserFactory(last_login=timezone.now())
+
+    def get_user(self, last_login):
+        with self.captureOnCommitCallbacks(execute=True):
+            return query.get_user_by_token_fields_cached(self.user.google_id, last_login)
+
+    def test_update_account_retires_cached_user(self):
+        self.get_user(self.user.last_login)
+        with self.captureOnCommitCallbacks(execute=True):
+            query.update_user({"id": self.user.id, "first_name": "Rob"})
+        self.assertEqual(self.get_user(self.user.last_login).first_name, "Rob")
+
+    def test_update_last_login_retires_cached_user(self):
+        old_login = self.user.last_login
+        self.get_user(old_login)
+        with self.captureOnCommitCallbacks(execute=True):
+            query.update_user_last_login(self.user)
+        with self.assertRaises(ObjectDoesNotExist):
+            self.get_user(old_login)
+        self.assertEqual(self.get_user(self.user.last_login), self.user)
+
+    def test_login_rotated_on_another_worker(self):
+        # Two workers' instances of a shared backend
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        worker_a, worker_b = FileBasedCache(directory.name, {}), FileBasedCache(directory.name, {})
+        old_login = self.user.last_login
+
+        with patch("jamco.cache.cache", worker_a):
+            self.get_user(old_login)
+        with patch("jamco.cache.cache", worker_b), self.captureOnCommitCallbacks(execute=True):
+            query.update_user_last_login(self.user)
+        with patch("jamco.cache.cache", worker_a), self.assertRaises(ObjectDoesNotExist):
+            self.get_user(old_login)
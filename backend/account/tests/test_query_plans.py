@@ -0,0 +1,76 @@
+from unittest import skipUnless
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from account import query
+from account.models import FriendRequest
+from account.tests.factories import UserFactory, PrivacyFactory
+
+
+@skipUnless(connection.vendor == "postgresql", "Query plans are only checked against Postgres")
+class QueryPlanTests(TestCase):
+    """
+    Runs EXPLAIN on the queries behind the hot account filters and fails unless they use the index meant for them.
+    The tables are filled with rows the filters skip and analyzed, and sequential scans are disabled for the test
+    transaction, so the planner picks the most selective index that fits.
+    """
+
+    def assertUsesIndexes(self, func, table, *indexes):
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {table}")
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        with CaptureQueriesContext(connection) as queries:
+            func()
+        statements = [captured["sql"] for captured in queries if f'"{table}"' in captured["sql"]]
+        self.assertTrue(statements, f"No queries against {table}")
+        with connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(f"EXPLAIN {statement}")
+                plan = "\n".join(row[0] for row in cursor.fetchall())
+                for index in indexes:
+                    # Either a single index name, or a tuple of indexes any of which will do
+                    names = index if isinstance(index, tuple) else (index,)
+                    self.assertTrue(any(f" {name} " in f"{plan} " for name in names), f"{statement}\n{plan}")
+
+    def column_indexes(self, table, column):
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, table)
+        return tuple(name for name, info in constraints.items() if info["index"] and info["columns"] == [column])
+
+    def test_pending_friend_requests(self):
+        user = UserFactory()
+        others = UserFactory.create_batch(20)
+        now = timezone.now()
+        # Plenty of requests between other users, and the user's own acknowledged ones
+        requests = [
+            FriendRequest(from_user=sender, to_user=receiver, sent=now, acknowledged=None)
+            for sender in others
+            for receiver in others
+            if sender != receiver
+        ]
+        requests += [FriendRequest(from_user=user, to_user=other, sent=now, acknowledged=now) for other in others]
+        requests += [FriendRequest(from_user=other, to_user=user, sent=now, acknowledged=now) for other in others]
+        requests += [
+            FriendRequest(from_user=user, to_user=others[0], sent=now, acknowledged=None),
+            FriendRequest(from_user=others[1], to_user=user, sent=now, acknowledged=None),
+        ]
+        FriendRequest.objects.bulk_create(requests)
+        self.assertUsesIndexes(
+            user.to_dict, "account_friendrequest", "friendrequest_pair_idx", "friendrequest_pending_to_idx"
+        )
+
+    def test_searchable_users(self):
+        PrivacyFactory(is_searchable=True)
+        PrivacyFactory.create_batch(50, is_searchable=False)
+        self.assertUsesIndexes(lambda: list(query.get_all_searchable()), "account_privacy", "privacy_searchable_idx")
+
+    def test_token_fields_lookup(self):
+        user = UserFactory(last_login=timezone.now())
+        UserFactory.create_batch(50)
+        self.assertUsesIndexes(
+            lambda: query.get_user_by_token_fields_noupdate(user.google_id, user.last_login),
+            "account_user",
+            # google_id's unique index, or the pattern ops index django adds next to it
+            self.column_indexes("account_user", "google_id"),
+        )
@@ -0,0 +1,52 @@
+import json
+import os
+import tempfile
+from unittest.mock import patch
+from django.test import TestCase, override_settings
+from account.templatetags import render_vite_bundle
+
+
+def write_manifest(directory, main_file, mtime):
+    os.makedirs(os.path.join(directory, "dist"), exist_ok=True)
+    path = os.path.join(directory, "dist", "manifest.json")
+    with open(path, "w") as fd:
+        json.dump(
+            {
+                "src/main.js": {"file": main_file, "css": ["main.css"], "dynamicImports": ["src/lazy.js"]},
+                "src/lazy.js": {"file": "lazy.js"},
+            },
+            fd,
+        )
+    os.utime(path, (mtime, mtime))
+
+
+class RenderViteBundleTests(TestCase):
+    def setUp(self):
+        self.vite_dir = tempfile.mkdtemp()
+        render_vite_bundle._bundle_cache = (None, 0.0, None)
+
+    def test_not_prod(self):
+        with override_settings(PROD=False):
+            self.assertIsNone(render_vite_bundle.render_vite_bundle())
+
+    def test_render_vite_bundle(self):
+        write_manifest(self.vite_dir, "main.js", 1000)
+        with override_settings(PROD=True, VITE_APP_DIR=self.vite_dir):
+            tags = render_vite_bundle.render_vite_bundle()
+        self.assertIn('src="/static/dist/main.js"', tags)
+        self.assertIn('href="/static/dist/main.css"', tags)
+        self.assertIn('src="/static/dist/lazy.js"', tags)
+
+    @patch("account.templatetags.render_vite_bundle.MANIFEST_CHECK_INTERVAL", 0)
+    def test_manifest_cached_until_changed(self):
+        write_manifest(self.vite_dir, "main.js", 1000)
+        with override_settings(PROD=True, VITE_APP_DIR=self.vite_dir):
+            first = render_vite_bundle.render_vite_bundle()
+            # The manifest isn't re-read while its mtime is unchanged
+            with patch("builtins.open") as mock_open:
+                self.assertEqual(render_vite_bundle.render_vite_bundle(), first)
+                mock_open.assert_not_called()
+
+            # A new build is picked up
+            write_manifest(self.vite_dir, "main-new.js", 2000)
+            self.assertIn('src="/static/dist/main-new.js"', render_vite_bundle.render_vite_bundle())
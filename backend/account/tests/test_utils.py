@@ -1,6 +1,7 @@
 from django.test import TestCase
+from unittest.mock import patch
 import json
-from account.auth_utils import decrypt_token, encrypt_token
+from account.auth_utils import decrypt_token, encrypt_token, parse_token_fields, clear_token_fields_cache
 from datetime import datetime
 
 
@@ -22,3 +23,17 @@ class AuthUtilsTests(TestCase):
             "user_google_id", datetime.strptime("2023-03-03 01:28:02.710196+00:00", "%Y-%m-%d %H:%M:%S.%f%z")
         )
         self.assertEqual(len(function_return), 204)
+
+
+class TokenFieldsCacheTests(TestCase):
+    def setUp(self):
+        clear_token_fields_cache()
+
+    def test_parse_token_fields(self):
+        last_login = datetime.strptime("2023-03-03 01:28:02.710196+00:00", "%Y-%m-%d %H:%M:%S.%f%z")
+        token = encrypt_token("user_google_id", last_login)
+        with patch("account.auth_utils.decrypt_token", wraps=decrypt_token) as mock_decrypt:
+            self.assertEqual(parse_token_fields(token), ("user_google_id", last_login))
+            self.assertEqual(parse_token_fields(token), ("user_google_id", last_login))
+            # The second call is answered from the cache
+            self.assertEqual(mock_decrypt.call_count, 1)
@@ -8,6 +8,9 @@ from django.urls import reverse  # noqa: E402
 from django.http.cookie import SimpleCookie  # noqa: E402
 from account.tests.factories import UserFactory, PrivacyFactory, FriendRequestFactory  # noqa: E402
 from django.core.exceptions import ObjectDoesNotExist  # noqa: E402
+from django.utils import timezone  # noqa: E402
+from account import query  # noqa: E402
+from account.auth_utils import encrypt_token  # noqa: E402
 
 
 class GetOrCreateAccountTests(TransactionTestCase):
@@ -275,7 +278,7 @@ class SearchTests(TestCase):
         u2 = UserFactory()
         u3 = UserFactory()
         mock_return = [u1.to_dict(), u2.to_dict(), u3.to_dict()]
-        mock_search_users_by_name.return_value = mock_return
+        mock_search_users_by_name.return_value = mock_return, None
 
         response = self.client.post(
             reverse("search_users_by_name"),
@@ -285,6 +288,27 @@ class SearchTests(TestCase):
         self.assertEqual(response.status_code, 200)
         content = json.loads(response.content)
         self.assertEqual(content["user_list"], mock_return)
+        self.assertIsNone(content["next_cursor"])
+
+    def test_search_users_by_name_paginated(self, mock_search_users_by_name):
+        mock_search_users_by_name.return_value = [], "next"
+
+        response = self.client.post(
+            reverse("search_users_by_name"),
+            json.dumps({"search": "search string proxy", "limit": 10, "cursor": "cursor"}),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content)["next_cursor"], "next")
+        mock_search_users_by_name.assert_called_with("search string proxy", limit=10, cursor="cursor")
+
+        mock_search_users_by_name.side_effect = ValueError("Invalid search cursor")
+        response = self.client.post(
+            reverse("search_users_by_name"),
+            json.dumps({"search": "search string proxy", "cursor": "garbage"}),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 400)
 
 
 @patch("account.business.authenticate_token")
@@ -451,3 +475,62 @@ class GetFriendRequestsStatusTests(TestCase):
         )
         self.assertEqual(response.status_code, 400)
         mock_get_friend_requests_status.assert_called_with(user_id=0)
+
+
+class AccountConditionalTests(TestCase):
+    def post(self, name, data, **headers):
+        return self.client.post(reverse(name), json.dumps(data), content_type="application/json", **headers)
+
+    def assertNotModifiedUntil(self, name, data, patched, change):
+        etag = self.post(name, data)["ETag"]
+        with patch(patched) as mock_view_query:
+            response = self.post(name, data, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        mock_view_query.assert_not_called()
+
+        change()
+        response = self.post(name, data, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        return response
+
+    def test_privacies_not_modified_until_changed(self):
+        user = UserFactory()
+        PrivacyFactory(user=user, is_searchable=True)
+        response = self.assertNotModifiedUntil(
+            "get_user_privacies",
+            {"user_id": user.id},
+            "account.business.get_privacies",
+            lambda: query.update_privacies(user.id, {"is_searchable": False}),
+        )
+        self.assertFalse(json.loads(response.content)["is_searchable"])
+
+    def test_friend_requests_not_modified_until_changed(self):
+        user, other = UserFactory(), UserFactory()
+        response = self.assertNotModifiedUntil(
+            "get_friend_requests_status",
+            {"user_id": user.id},
+            "account.business.get_friend_requests_status",
+            lambda: query.create_friend_request(other.id, user.id),
+        )
+        self.assertEqual(len(json.loads(response.content)["received"]), 1)
+
+    def test_user_data_not_modified_until_friend_renamed(self):
+        user, friend = UserFactory(last_login=timezone.now()), UserFactory()
+        query.add_friend(user.id, friend.id)
+        response = self.assertNotModifiedUntil(
+            "get_updated_user_data",
+            encrypt_token(user.google_id, user.last_login),
+            "account.business.validate_token",
+            lambda: query.update_user({"id": friend.id, "first_name": "Rob"}),
+        )
+        self.assertEqual(json.loads(response.content)["user"]["friends"][0]["first_name"], "Rob")
+
+    def test_user_data_stale_token(self):
+        user = UserFactory(last_login=timezone.now())
+        token = encrypt_token(user.google_id, user.last_login)
+        etag = self.post("get_updated_user_data", token)["ETag"]
+        query.update_user_last_login(user)
+        # A token for an older login never gets a 304
+        response = self.post("get_updated_user_data", token, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 401)
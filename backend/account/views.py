@@ -5,14 +5,14 @@ API-layer for account related operations.
 """
 import logging
 from django.conf import settings
-from django.http import HttpRequest, JsonResponse
+from django.http import HttpRequest
 from django.views.decorators.http import require_POST
 from django.core.exceptions import ObjectDoesNotExist
 from google.oauth2 import id_token
 from google.auth.transport import requests
 from account.decorators import requires_login
 from account.stubs import stub_verify_oauth2_token
-from jamco.helper import read_request
+from jamco.helper import read_request, JsonResponse, conditional_json
 from . import business
 
 logger = logging.getLogger(__name__)
@@ -34,8 +34,8 @@ def get_or_create_account(request: HttpRequest):
     body = read_request(request)
     client_id = body["client_id"]
     credential = body["credential"]
-    logger.debug(f"get_or_create_account: {credential}")
-    logger.debug(f"body: {body}")
+    logger.debug("get_or_create_account: %s", credential)
+    logger.debug("body: %s", body)
 
     # Verify Credentials via Google
     try:
@@ -47,14 +47,14 @@ def get_or_create_account(request: HttpRequest):
             idinfo = stub_verify_oauth2_token(credential, client_id)
 
         # ID token is valid. Get the user's Google Account ID from the decoded token.
-        logger.debug(f"Credential Validated for User.google_id: { idinfo['sub'] }")
+        logger.debug("Credential Validated for User.google_id: %s", idinfo["sub"])
 
         user, token = business.get_or_create_user(idinfo)
         return JsonResponse({"data": user.to_dict(), "token": token})
 
     except ValueError as err_msg:
         # Invalid token
-        logger.debug(f"Invalid Token: {err_msg}")
+        logger.debug("Invalid Token: %s", err_msg)
         return JsonResponse(status=401, data={"error": repr(err_msg)})
 
 
@@ -66,7 +66,7 @@ def update_account(request: HttpRequest):
     """
 
     body = read_request(request)
-    logger.debug(f"update_account: {id}")
+    logger.debug("update_account: %s", body.get("id"))
 
     try:
         business.update_user(body)
@@ -74,7 +74,7 @@ def update_account(request: HttpRequest):
         # Complain if the frontend tried to modify fields that aren't part of
         # the User model (AttributeError), tries to modify a user that doesn't
         # exist (ObjectDoesNotExist), or doesn't supply the Google ID (KeyError)
-        logger.debug(f"Update error:\n{err_msg}")
+        logger.debug("Update error:\n%s", err_msg)
         return JsonResponse(status=400, data={"error": repr(err_msg)})
 
     return JsonResponse(status=200, data={})
@@ -88,12 +88,12 @@ def update_privacies(request: HttpRequest):
     """
 
     body = read_request(request)
-    logger.debug(f"update_privacies: {body}")
+    logger.debug("update_privacies: %s", body)
 
     try:
         business.update_privacies(body)
     except Exception as err_msg:
-        logger.debug(f"Update error:\n{err_msg}")
+        logger.debug("Update error:\n%s", err_msg)
         return JsonResponse(status=400, data={"error": repr(err_msg)})
 
     return JsonResponse(status=200, data={})
@@ -101,16 +101,17 @@ def update_privacies(request: HttpRequest):
 
 @require_POST
 @requires_login(allow_friends=True)
+@conditional_json(lambda body: business.get_account_etag("privacies", body.get("user_id")))
 def get_user_privacies(request: HttpRequest):
     """
     Gets Privacy options for the specified user
     """
 
     body = read_request(request)
-    logger.debug(f"get_user_privacies: {body}")
+    logger.debug("get_user_privacies: %s", body)
     user_id = body.get("user_id")
 
-    logger.debug(f"get_user_privacies: user: {user_id}")
+    logger.debug("get_user_privacies: user: %s", user_id)
 
     try:
         priv = business.get_privacies(user_id)
@@ -131,7 +132,7 @@ def remove_friend(request: HttpRequest):
         body = read_request(request)
         user1_id = body["user1_id"]
         user2_id = body["user2_id"]
-        logger.debug(f"add_friend: {user1_id}, {user2_id}")
+        logger.debug("add_friend: %s, %s", user1_id, user2_id)
 
         business.remove_friend(user1_id, user2_id)
         return JsonResponse(status=200, data={})
@@ -146,30 +147,31 @@ def validate_auth_token(request: HttpRequest):
     """
 
     token = read_request(request)
-    logger.debug(f"validate_auth_token: {token}")
+    logger.debug("validate_auth_token: %s", token)
 
     try:
         user, new_token = business.authenticate_token(token)
         return JsonResponse({"user": user.to_dict(), "token": new_token})
     except ObjectDoesNotExist as err_msg:
-        logger.debug(f"Invalid Token: {err_msg}")
+        logger.debug("Invalid Token: %s", err_msg)
         return JsonResponse(status=401, data={"error": repr(err_msg)})
 
 
 @require_POST
+@conditional_json(business.get_user_data_etag)
 def get_updated_user_data(request: HttpRequest):
     """
     Authenticates auth_token retrieved from local cookies, without creating a new cookie
     """
 
     token = read_request(request)
-    logger.debug(f"get_updated_user_data: {token}")
+    logger.debug("get_updated_user_data: %s", token)
 
     try:
         user = business.validate_token(token)
         return JsonResponse({"user": user.to_dict()})
     except ObjectDoesNotExist as err_msg:
-        logger.debug(f"Invalid Token: {err_msg}")
+        logger.debug("Invalid Token: %s", err_msg)
         return JsonResponse(status=401, data={"error": repr(err_msg)})
 
 
@@ -177,12 +179,22 @@ def get_updated_user_data(request: HttpRequest):
 def search_users_by_name(request: HttpRequest):
     """
     Searches for [searchable] users by name
+    Accepts either the search string, or {search, limit, cursor} to page through the results
     """
 
-    search_str = read_request(request)
-    logger.debug(f"Searching for users like '{search_str}'")
-    users_list = business.search_users_by_name(search_str)
-    return JsonResponse(data={"user_list": users_list})
+    body = read_request(request)
+    if isinstance(body, str):
+        body = {"search": body}
+    search_str = body.get("search", "")
+    logger.debug("Searching for users like '%s'", search_str)
+
+    try:
+        users_list, next_cursor = business.search_users_by_name(
+            search_str, limit=body.get("limit", business.SEARCH_RESULT_LIMIT), cursor=body.get("cursor")
+        )
+        return JsonResponse(data={"user_list": users_list, "next_cursor": next_cursor})
+    except (ValueError, TypeError) as err_msg:
+        return JsonResponse(status=400, data={"error": repr(err_msg)})
 
 
 @require_POST
@@ -196,7 +208,7 @@ def create_friend_request(request: HttpRequest):
         body = read_request(request)
         from_user_id = body["from_user_id"]
         to_user_id = body["to_user_id"]
-        logger.debug(f"create_friend_request: {from_user_id} -> {to_user_id}")
+        logger.debug("create_friend_request: %s -> %s", from_user_id, to_user_id)
 
         req = business.create_friend_request(from_user_id=from_user_id, to_user_id=to_user_id)
         return JsonResponse(data=req.to_dict())
@@ -216,7 +228,7 @@ def accept_friend_request(request: HttpRequest):
         request_id = body["request_id"]
         from_user_id = body["from_user_id"]
         to_user_id = body["to_user_id"]
-        logger.debug(f"accept_friend_request: ToUser:{to_user_id}, FromUser:{from_user_id}, Request: {request_id}")
+        logger.debug("accept_friend_request: ToUser:%s, FromUser:%s, Request: %s", to_user_id, from_user_id, request_id)
 
         business.accept_friend_request(request_id=request_id, to_user_id=to_user_id, from_user_id=from_user_id)
         return JsonResponse(status=200, data={})
@@ -236,7 +248,7 @@ def deny_friend_request(request: HttpRequest):
         request_id = body["request_id"]
         from_user_id = body["from_user_id"]
         to_user_id = body["to_user_id"]
-        logger.debug(f"deny_friend_request: ToUser:{to_user_id}, FromUser:{from_user_id}, Request: {request_id}")
+        logger.debug("deny_friend_request: ToUser:%s, FromUser:%s, Request: %s", to_user_id, from_user_id, request_id)
 
         business.deny_friend_request(request_id=request_id, to_user_id=to_user_id, from_user_id=from_user_id)
         return JsonResponse(status=200, data={})
@@ -246,6 +258,7 @@ def deny_friend_request(request: HttpRequest):
 
 @require_POST
 @requires_login(check_field="user_id")
+@conditional_json(lambda body: business.get_account_etag("friend-requests", body.get("user_id")))
 def get_friend_requests_status(request: HttpRequest):
     """
     Get sent & received requests for a user
@@ -254,7 +267,7 @@ def get_friend_requests_status(request: HttpRequest):
     try:
         body = read_request(request)
         user_id = body["user_id"]
-        logger.debug(f"get_friend_requests_status: {user_id}")
+        logger.debug("get_friend_requests_status: %s", user_id)
 
         sent, received = business.get_friend_requests_status(user_id=user_id)
 
@@ -274,7 +287,7 @@ def get_friend_data(request: HttpRequest):
         body = read_request(request)
         user_id = body["user_id"]
         friend_id = body["friend_id"]
-        logger.debug(f"get_friend_data: Getting info from user {friend_id} for user {user_id}")
+        logger.debug("get_friend_data: Getting info from user %s for user %s", friend_id, user_id)
 
         friend = business.get_friend_data(user_id=user_id, friend_id=friend_id)
 
@@ -0,0 +1,79 @@
+"""
+Board business
+
+Business logic for syncing a user's kanban board.
+"""
+from . import query
+from account import query as account_query
+from board.models import DeletedBoardItem
+from column import query as column_query
+from job import query as job_query
+
+
+def get_version(user_id: int) -> int:
+    return query.get_version(user_id)
+
+
+def get_board_etag(name: str, user_id: int) -> str:
+    # Changes to the user's columns or jobs bump their board version, which retires this etag
+    return f"{name}-{user_id}-{query.get_version(user_id)}"
+
+
+def get_board_changes(user_id: int, since: int = None) -> dict:
+    """
+    Returns the user's columns and (minimum) jobs changed after version `since`, the ids of those deleted since then,
+    and the current version to pass as `since` next time. Without `since`, or when the deletions after it have been
+    pruned, the whole board is returned with `full` set, and the client replaces its copy instead of patching it.
+    """
+    # bool is a subclass of int, but true isn't a version
+    if since is not None and (isinstance(since, bool) or not isinstance(since, int) or since < 0):
+        raise ValueError("Invalid board version")
+
+    # Read from one snapshot, so a concurrent prune can't remove deletions between the pruned version check and
+    # the deletion lookup
+    with query.snapshot():
+        return _get_board_changes(user_id, since)
+
+
+def _get_board_changes(user_id: int, since: int = None) -> dict:
+    # The version is read before the rows, so anything committed in between is sent again next time
+    # rather than missed
+    version = query.get_version(user_id)
+    if since is not None and since > version:
+        raise ValueError("Board version is ahead of the server")
+    if since is not None and since < query.get_pruned_version(user_id):
+        since = None
+
+    columns = column_query.get_columns(user_id).order_by("column_number")
+    jobs = job_query.get_minimum_jobs(user_id)
+    deleted_column_ids, deleted_job_ids = [], []
+    if since is not None:
+        columns = columns.filter(version__gt=since)
+        jobs = jobs.filter(version__gt=since)
+        for kind, item_id in query.get_deletions(user_id, since):
+            (deleted_column_ids if kind == DeletedBoardItem.COLUMN else deleted_job_ids).append(item_id)
+
+    return {
+        "version": version,
+        "full": since is None,
+        "columns": [column.to_dict() for column in columns],
+        "jobs": list(jobs),
+        "deleted_column_ids": deleted_column_ids,
+        "deleted_job_ids": deleted_job_ids,
+    }
+
+
+def get_board(user_id: int) -> dict:
+    """
+    Returns everything needed to open the user's kanban: their columns, (minimum) jobs, privacies,
+    and the board version to sync from afterwards. All of it is read from one snapshot.
+    """
+    with query.snapshot():
+        board = _get_board_changes(user_id)
+        privacies = account_query.get_privacies(user_id)
+    return {
+        "version": board["version"],
+        "columns": board["columns"],
+        "jobs": board["jobs"],
+        "privacies": privacies.to_dict(),
+    }
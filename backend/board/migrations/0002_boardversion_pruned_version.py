@@ -0,0 +1,17 @@
+# Generated by Django 4.1.5 on 2026-10-18 14:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("board", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="boardversion",
+            name="pruned_version",
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,25 @@
+from django.db import models
+from account.models import User
+
+
+class BoardVersion(models.Model):
+    # Bumped once per change to any of the user's columns or jobs. Changed rows are stamped with the new version,
+    # so clients can ask for everything after the version they last saw.
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True)
+    version = models.PositiveBigIntegerField(default=0)
+    # Deletions up to this version have been pruned, so changes since an older version can't be listed
+    pruned_version = models.PositiveBigIntegerField(default=0)
+
+
+class DeletedBoardItem(models.Model):
+    JOB = "job"
+    COLUMN = "column"
+    KIND_CHOICES = [(JOB, "Job"), (COLUMN, "Column")]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    kind = models.CharField(max_length=6, choices=KIND_CHOICES)
+    item_id = models.BigIntegerField()
+    version = models.PositiveBigIntegerField()
+
+    class Meta:
+        indexes = [models.Index(fields=["user", "version"], name="deletedboarditem_version_idx")]
@@ -0,0 +1,86 @@
+"""
+Board queries
+
+Query functions for board versioning and change tracking.
+"""
+from contextlib import contextmanager
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.db.models.query import QuerySet
+from board.models import BoardVersion, DeletedBoardItem
+from job.models import Job
+
+
+@contextmanager
+def snapshot():
+    """
+    Runs the enclosed reads in a single transaction.
+    On postgres it's a read only REPEATABLE READ transaction, so every read sees the same snapshot.
+    """
+    outermost = not connection.in_atomic_block
+    with transaction.atomic():
+        if outermost and connection.vendor == "postgresql":
+            # Has to be the first statement of the transaction
+            with connection.cursor() as cursor:
+                cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY")
+        yield
+
+
+def bump_version(user_id: int) -> int:
+    # The UPDATE's row lock is held until the surrounding transaction commits, so concurrent changes
+    # to the same board get consecutive versions and commit in version order
+    if not BoardVersion.objects.filter(user_id=user_id).update(version=F("version") + 1):
+        BoardVersion.objects.get_or_create(user_id=user_id)
+        BoardVersion.objects.filter(user_id=user_id).update(version=F("version") + 1)
+    return BoardVersion.objects.values_list("version", flat=True).get(user_id=user_id)
+
+
+def get_version(user_id: int) -> int:
+    return BoardVersion.objects.filter(user_id=user_id).values_list("version", flat=True).first() or 0
+
+
+def get_pruned_version(user_id: int) -> int:
+    return BoardVersion.objects.filter(user_id=user_id).values_list("pruned_version", flat=True).first() or 0
+
+
+def record_job_deletions(user_id: int, version: int, job_ids: list[int]) -> None:
+    DeletedBoardItem.objects.bulk_create(
+        [
+            DeletedBoardItem(user_id=user_id, kind=DeletedBoardItem.JOB, item_id=job_id, version=version)
+            for job_id in job_ids
+        ]
+    )
+    prune_deletions(user_id, version)
+
+
+def record_column_deletions(user_id: int, version: int, column_ids: list[int]) -> None:
+    # Deleting a column cascades to its jobs, so they're recorded as deleted too.
+    # This has to run before the columns are deleted.
+    if not column_ids:
+        return
+    job_ids = list(Job.objects.filter(kcolumn_id__in=column_ids).values_list("id", flat=True))
+    DeletedBoardItem.objects.bulk_create(
+        [
+            DeletedBoardItem(user_id=user_id, kind=DeletedBoardItem.COLUMN, item_id=column_id, version=version)
+            for column_id in column_ids
+        ]
+        + [
+            DeletedBoardItem(user_id=user_id, kind=DeletedBoardItem.JOB, item_id=job_id, version=version)
+            for job_id in job_ids
+        ]
+    )
+    prune_deletions(user_id, version)
+
+
+def prune_deletions(user_id: int, version: int) -> None:
+    # Runs after bump_version, so the board version row is already locked by the surrounding transaction
+    pruned_version = version - settings.BOARD_DELETION_RETENTION
+    if pruned_version > 0 and DeletedBoardItem.objects.filter(user_id=user_id, version__lte=pruned_version).delete()[0]:
+        BoardVersion.objects.filter(user_id=user_id, pruned_version__lt=pruned_version).update(
+            pruned_version=pruned_version
+        )
+
+
+def get_deletions(user_id: int, since: int) -> QuerySet:
+    return DeletedBoardItem.objects.filter(user_id=user_id, version__gt=since).values_list("kind", "item_id")
@@ -0,0 +1,121 @@
+from django.test import TestCase, override_settings
+from django.core.exceptions import ObjectDoesNotExist
+from board import business
+from account.tests.factories import UserFactory, PrivacyFactory
+from column import business as column_business
+from column.tests.factories import KanbanColumnFactory
+from job import business as job_business
+from job.tests.factories import JobFactory
+
+
+class GetBoardChangesTests(TestCase):
+    def setUp(self):
+        self.user = UserFactory()
+        self.column = KanbanColumnFactory(user=self.user, name="To Apply", column_number=0)
+        self.other_column = KanbanColumnFactory(user=self.user, name="Interview", column_number=1)
+        self.job = JobFactory(user=self.user, kcolumn=self.column)
+
+    def create_job(self, column):
+        return job_business.create_job(
+            {"user_id": self.user.id, "kcolumn_id": column.id, "position_title": "Dev", "company": "Google"}
+        )
+
+    def test_full_board(self):
+        changes = business.get_board_changes(self.user.id)
+        self.assertEqual(changes["version"], 0)
+        self.assertEqual([column["id"] for column in changes["columns"]], [self.column.id, self.other_column.id])
+        self.assertEqual([job["id"] for job in changes["jobs"]], [self.job.id])
+        self.assertEqual(changes["deleted_column_ids"], [])
+        self.assertEqual(changes["deleted_job_ids"], [])
+
+    def test_nothing_changed(self):
+        changes = business.get_board_changes(self.user.id, 0)
+        self.assertEqual(
+            changes,
+            {"version": 0, "full": False, "columns": [], "jobs": [], "deleted_column_ids": [], "deleted_job_ids": []},
+        )
+
+    def test_job_changes(self):
+        created = self.create_job(self.column)
+        version = business.get_board_changes(self.user.id)["version"]
+
+        job_business.update_job({"id": self.job.id, "user_id": self.user.id, "kcolumn_id": self.other_column.id})
+        job_business.delete_job(self.user.id, created.id)
+
+        changes = business.get_board_changes(self.user.id, version)
+        self.assertEqual(changes["version"], version + 2)
+        self.assertEqual(changes["columns"], [])
+        self.assertEqual(
+            [(job["id"], job["kcolumn"]) for job in changes["jobs"]], [(self.job.id, self.other_column.id)]
+        )
+        self.assertEqual(changes["deleted_job_ids"], [created.id])
+
+    def test_column_changes(self):
+        moved = self.create_job(self.other_column)
+        version = business.get_board_changes(self.user.id)["version"]
+
+        # Rename the first column, delete the second and add a new one
+        column_business.update_columns(
+            self.user.id,
+            [
+                {"id": self.column.id, "name": "Applying", "column_number": 0},
+                {"id": -1, "name": "Offer", "column_number": 1},
+            ],
+        )
+
+        changes = business.get_board_changes(self.user.id, version)
+        self.assertEqual(changes["version"], version + 1)
+        self.assertEqual([column["name"] for column in changes["columns"]], ["Applying", "Offer"])
+        self.assertEqual(changes["deleted_column_ids"], [self.other_column.id])
+        # Jobs in the deleted column went with it
+        self.assertEqual(changes["deleted_job_ids"], [moved.id])
+        self.assertEqual(changes["jobs"], [])
+
+    @override_settings(BOARD_DELETION_RETENTION=2)
+    def test_pruned_deletions_full_resync(self):
+        old_version = business.get_board_changes(self.user.id)["version"]
+        first = self.create_job(self.column)
+        job_business.delete_job(self.user.id, first.id)
+        second = self.create_job(self.column)
+        recent_version = business.get_board_changes(self.user.id)["version"]
+        job_business.delete_job(self.user.id, second.id)
+
+        # The first deletion is more than two versions old and has been pruned
+        changes = business.get_board_changes(self.user.id, old_version)
+        self.assertTrue(changes["full"])
+        self.assertEqual([job["id"] for job in changes["jobs"]], [self.job.id])
+        self.assertEqual(changes["deleted_job_ids"], [])
+
+        changes = business.get_board_changes(self.user.id, recent_version)
+        self.assertFalse(changes["full"])
+        self.assertEqual(changes["deleted_job_ids"], [second.id])
+
+    def test_invalid_version(self):
+        with self.assertRaises(ValueError):
+            business.get_board_changes(self.user.id, -1)
+        with self.assertRaises(ValueError):
+            business.get_board_changes(self.user.id, "1")
+        with self.assertRaises(ValueError):
+            business.get_board_changes(self.user.id, True)
+        with self.assertRaises(ValueError):
+            business.get_board_changes(self.user.id, 1)
+
+
+class GetBoardTests(TestCase):
+    def test_get_board(self):
+        privacy = PrivacyFactory(share_kanban=False)
+        user = privacy.user
+        column = KanbanColumnFactory(user=user)
+        job = JobFactory(user=user, kcolumn=column)
+
+        # One read each for the version, user, columns, jobs and privacies, plus the transaction
+        with self.assertNumQueries(7):
+            board = business.get_board(user.id)
+        self.assertEqual(board["version"], 0)
+        self.assertEqual(board["columns"], [column.to_dict()])
+        self.assertEqual([board_job["id"] for board_job in board["jobs"]], [job.id])
+        self.assertEqual(board["privacies"], privacy.to_dict())
+
+    def test_get_board_nonexistent_user(self):
+        with self.assertRaises(ObjectDoesNotExist):
+            business.get_board(-1)
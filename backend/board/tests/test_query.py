@@ -0,0 +1,52 @@
+from django.test import TestCase, override_settings
+from board import query
+from board.models import DeletedBoardItem
+from account.tests.factories import UserFactory
+from column.tests.factories import KanbanColumnFactory
+from job.tests.factories import JobFactory
+
+
+class BoardVersionTests(TestCase):
+    def test_bump_version(self):
+        user = UserFactory()
+        other_user = UserFactory()
+        self.assertEqual(query.get_version(user.id), 0)
+
+        self.assertEqual(query.bump_version(user.id), 1)
+        self.assertEqual(query.bump_version(user.id), 2)
+        self.assertEqual(query.get_version(user.id), 2)
+        # Versions are per user
+        self.assertEqual(query.get_version(other_user.id), 0)
+
+
+class DeletionTests(TestCase):
+    def test_record_job_deletions(self):
+        user = UserFactory()
+        query.record_job_deletions(user.id, 1, [10, 11])
+        query.record_job_deletions(user.id, 2, [12])
+
+        self.assertEqual(list(query.get_deletions(user.id, 0)), [("job", 10), ("job", 11), ("job", 12)])
+        self.assertEqual(list(query.get_deletions(user.id, 1)), [("job", 12)])
+        self.assertEqual(list(query.get_deletions(user.id, 2)), [])
+
+    @override_settings(BOARD_DELETION_RETENTION=2)
+    def test_old_deletions_pruned(self):
+        user = UserFactory()
+        for version in range(1, 5):
+            query.record_job_deletions(user.id, query.bump_version(user.id), [version])
+
+        # Deletions up to version 4 - 2 are gone, and the board remembers where it stopped
+        self.assertEqual(list(query.get_deletions(user.id, 0)), [("job", 3), ("job", 4)])
+        self.assertEqual(query.get_pruned_version(user.id), 2)
+        self.assertEqual(query.get_pruned_version(UserFactory().id), 0)
+
+    def test_record_column_deletions_includes_jobs(self):
+        column = KanbanColumnFactory()
+        job = JobFactory(user=column.user, kcolumn=column)
+        JobFactory(user=column.user)
+
+        query.record_column_deletions(column.user.id, 1, [column.id])
+        self.assertEqual(
+            set(query.get_deletions(column.user.id, 0)),
+            {(DeletedBoardItem.COLUMN, column.id), (DeletedBoardItem.JOB, job.id)},
+        )
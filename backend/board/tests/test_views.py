@@ -0,0 +1,57 @@
+import json
+from unittest.mock import patch
+
+patch("account.decorators.requires_login", lambda *args, **kwargs: lambda x: x).start()
+
+from django.test import RequestFactory, TestCase  # noqa: E402
+from board import views  # noqa: E402
+
+
+@patch("board.business.get_board_changes")
+class GetBoardChangesTests(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def test_get_board_changes(self, mock_get_board_changes):
+        changes = {"version": 3, "columns": [], "jobs": [], "deleted_column_ids": [1], "deleted_job_ids": [2]}
+        mock_get_board_changes.return_value = changes
+        request = self.factory.post(
+            "/get_board_changes/", data=json.dumps({"user_id": 1, "since": 2}), content_type="application/json"
+        )
+
+        response = views.get_board_changes(request)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content), changes)
+        mock_get_board_changes.assert_called_with(1, 2)
+
+    def test_get_board_changes_error(self, mock_get_board_changes):
+        mock_get_board_changes.side_effect = ValueError("Invalid board version")
+        request = self.factory.post(
+            "/get_board_changes/", data=json.dumps({"user_id": 1, "since": -1}), content_type="application/json"
+        )
+
+        response = views.get_board_changes(request)
+        self.assertEqual(response.status_code, 400)
+
+
+@patch("board.business.get_board")
+class GetBoardTests(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def test_get_board(self, mock_get_board):
+        board = {"version": 0, "columns": [], "jobs": [], "privacies": {"id": 1, "share_kanban": True}}
+        mock_get_board.return_value = board
+        request = self.factory.post("/get_board/", data=json.dumps({"user_id": 1}), content_type="application/json")
+
+        response = views.get_board(request)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content), board)
+        mock_get_board.assert_called_with(1)
+
+    def test_get_board_error(self, mock_get_board):
+        mock_get_board.side_effect = Exception("Error")
+        request = self.factory.post("/get_board/", data=json.dumps({"user_id": 1}), content_type="application/json")
+
+        response = views.get_board(request)
+        self.assertEqual(response.status_code, 400)
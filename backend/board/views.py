@@ -0,0 +1,51 @@
+"""
+Board views
+
+API-layer for syncing a user's kanban board.
+"""
+import logging
+from django.http import HttpRequest
+from django.views.decorators.http import require_POST
+from account.decorators import requires_login
+from jamco.helper import read_request, JsonResponse
+from . import business
+
+logger = logging.getLogger(__name__)
+
+
+@require_POST
+@requires_login(allow_friends=True, check_field="user_id")
+def get_board_changes(request: HttpRequest):
+    """
+    Gets the columns and jobs that changed since the board version the client last saw ("since"),
+    along with the ids of deleted ones and the new version.
+    Leaving out "since", or a "since" older than the remembered deletions, returns the whole board with "full" set.
+    """
+
+    body = read_request(request)
+    user_id = body.get("user_id")
+    since = body.get("since")
+    logger.debug("get_board_changes: %s, since %s", user_id, since)
+
+    try:
+        return JsonResponse(status=200, data=business.get_board_changes(user_id, since))
+    except Exception as err_msg:
+        return JsonResponse(status=400, data={"error": repr(err_msg)})
+
+
+@require_POST
+@requires_login(allow_friends=True, check_field="user_id")
+def get_board(request: HttpRequest):
+    """
+    Gets a user's columns, minimum jobs and privacies in one call
+    Called on Kanban Load, in place of get_columns, get_minimum_jobs and get_user_privacies
+    """
+
+    body = read_request(request)
+    user_id = body.get("user_id")
+    logger.debug("get_board: %s", user_id)
+
+    try:
+        return JsonResponse(status=200, data=business.get_board(user_id))
+    except Exception as err_msg:
+        return JsonResponse(status=400, data={"error": repr(err_msg)})
@@ -3,23 +3,35 @@ Account business
 
 Business logic for account related operations.
 """
+from django.db import transaction
 from . import query
 from column.models import KanbanColumn
+from board import query as board_query
+from jamco import cache as user_cache
 
 
 def get_columns(user_id: int) -> list[KanbanColumn]:
-    columns = query.get_columns(user_id)
-    # Make sure the columns are sorted
-    return list(columns.order_by("column_number"))
+    # Make sure the columns are sorted. Cached columns are tied to the board version, so they're never older
+    # than the version get_columns' etag was built from
+    return user_cache.get_or_load(
+        user_cache.COLUMNS,
+        user_id,
+        lambda: list(query.get_columns(user_id).order_by("column_number")),
+        version=board_query.get_version(user_id),
+    )
+
+
+DEFAULT_COLUMNS = ["To Apply", "Application Submitted", "OA", "Interview"]
 
 
 def create_default_columns(user_id: int):
-    query.create_column(user_id, "To Apply", 0)
-    query.create_column(user_id, "Application Submitted", 1)
-    query.create_column(user_id, "OA", 2)
-    query.create_column(user_id, "Interview", 3)
+    query.create_columns(
+        user_id, [{"name": name, "column_number": number} for number, name in enumerate(DEFAULT_COLUMNS)]
+    )
+    user_cache.invalidate(user_cache.COLUMNS, user_id)
 
 
+@transaction.atomic
 def update_columns(user_id: int, payload: list[dict]) -> list[KanbanColumn]:
     # Ensure that all fields are present and valid before doing any operations
     for column_spec in payload:
@@ -34,30 +46,39 @@ def update_columns(user_id: int, payload: list[dict]) -> list[KanbanColumn]:
             )
 
     # Separate current columns into ones to update and ones to delete
-    ids_in_payload = [column_spec["id"] for column_spec in payload]
+    ids_in_payload = {column_spec["id"] for column_spec in payload}
     existing_columns = {}
     ids_to_delete = []
-    for column in get_columns(user_id):
+    # Read from the database rather than the cache, since these rows are written back
+    for column in query.get_columns(user_id):
         if column.id in ids_in_payload:
             existing_columns[column.id] = column
         else:
             ids_to_delete.append(column.id)
+    version = board_query.bump_version(user_id)
     # Delete columns whose ids aren't in the payload
+    board_query.record_column_deletions(user_id, version, ids_to_delete)
     query.delete_columns(ids_to_delete)
 
     # Create, rename, and reorder columns
+    new_columns = []
     for column_spec in payload:
         column_id = column_spec["id"]
         if column_id not in existing_columns:
-            # Create a new column
-            query.create_column(user_id, column_spec["name"], column_spec["column_number"])
+            new_columns.append(column_spec)
         else:
             # Rename
             existing_columns[column_id].name = column_spec["name"]
             # Reorder
             existing_columns[column_id].column_number = column_spec["column_number"]
+            existing_columns[column_id].version = version
 
-    for column in existing_columns.values():
-        column.save()
+    # One insert for the new columns and one update for the existing ones, however many columns there are
+    query.create_columns(user_id, new_columns, version)
+    query.update_columns(list(existing_columns.values()))
 
+    user_cache.invalidate(user_cache.COLUMNS, user_id)
+    if ids_to_delete:
+        # The deleted columns' jobs went with them
+        user_cache.invalidate(user_cache.MINIMUM_JOBS, user_id)
     return get_columns(user_id)
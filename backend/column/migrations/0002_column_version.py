@@ -0,0 +1,21 @@
+# Generated by Django 4.1.5 on 2026-10-18 14:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("column", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="kanbancolumn",
+            name="version",
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name="kanbancolumn",
+            index=models.Index(fields=["user", "version"], name="kanbancolumn_version_idx"),
+        ),
+    ]
@@ -6,6 +6,11 @@ class KanbanColumn(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     name = models.CharField(max_length=30)
     column_number = models.IntegerField()
+    # The user's board version when this column last changed
+    version = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        indexes = [models.Index(fields=["user", "version"], name="kanbancolumn_version_idx")]
 
     def to_dict(self):
         return {"id": self.id, "name": self.name, "column_number": self.column_number}
@@ -8,14 +8,28 @@ from account.models import User
 from column.models import KanbanColumn
 
 
-def create_column(user_id: int, column_name: str, column_number: int) -> KanbanColumn:
-    return KanbanColumn.objects.create(user=User.objects.get(id=user_id), name=column_name, column_number=column_number)
-
-
 def get_columns(user_id: int) -> list[KanbanColumn]:
     return KanbanColumn.objects.filter(user=User.objects.get(id=user_id))
 
 
+def create_columns(user_id: int, column_specs: list[dict], version: int = 0) -> list[KanbanColumn]:
+    # The caller is expected to have checked that the user exists
+    return KanbanColumn.objects.bulk_create(
+        [
+            KanbanColumn(
+                user_id=user_id,
+                name=column_spec["name"],
+                column_number=column_spec["column_number"],
+                version=version,
+            )
+            for column_spec in column_specs
+        ]
+    )
+
+
+def update_columns(columns: list[KanbanColumn]) -> None:
+    KanbanColumn.objects.bulk_update(columns, ["name", "column_number", "version"])
+
+
 def delete_columns(ids: list[int]):
-    for column_id in ids:
-        KanbanColumn.objects.filter(id=column_id).delete()
+    KanbanColumn.objects.filter(id__in=ids).delete()
@@ -5,18 +5,30 @@ from account.tests.factories import UserFactory
 from column.tests.factories import KanbanColumnFactory
 from column.models import KanbanColumn
 from unittest.mock import patch
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 
 class CreateDefaultColumnsTests(TestCase):
-    @patch("column.query.create_column")
-    def test_default_columns(self, mock_create_column):
+    @patch("column.query.create_columns")
+    def test_default_columns(self, mock_create_columns):
         user = UserFactory()
         business.create_default_columns(user.id)
-        mock_create_column.assert_any_call(user.id, "To Apply", 0)
-        mock_create_column.assert_any_call(user.id, "Application Submitted", 1)
-        mock_create_column.assert_any_call(user.id, "OA", 2)
-        mock_create_column.assert_any_call(user.id, "Interview", 3)
-        self.assertEqual(mock_create_column.call_count, 4)
+        mock_create_columns.assert_called_once_with(
+            user.id,
+            [
+                {"name": "To Apply", "column_number": 0},
+                {"name": "Application Submitted", "column_number": 1},
+                {"name": "OA", "column_number": 2},
+                {"name": "Interview", "column_number": 3},
+            ],
+        )
+
+    def test_default_columns_single_insert(self):
+        user = UserFactory()
+        with self.assertNumQueries(1):
+            business.create_default_columns(user.id)
+        self.assertEqual([column.name for column in business.get_columns(user.id)], business.DEFAULT_COLUMNS)
 
 
 class GetColumnsTests(TestCase):
@@ -37,9 +49,9 @@ class GetColumnsTests(TestCase):
 
 @patch("column.query.get_columns")
 @patch("column.query.delete_columns")
-@patch("column.query.create_column")
+@patch("column.query.create_columns")
 class UpdateColumnsTests(TestCase):
-    def test_rename(self, mock_create_column, mock_delete_column, mock_get_columns):
+    def test_rename(self, mock_create_columns, mock_delete_column, mock_get_columns):
         user = UserFactory()
         col1 = KanbanColumnFactory(user=user, column_number=0, name="Old column")
         col2 = KanbanColumnFactory(user=user, column_number=1)
@@ -72,7 +84,7 @@ class UpdateColumnsTests(TestCase):
         self.assertEqual(columns[2].column_number, 2)
         self.assertEqual(len(query.get_columns(user.id)), 3)
 
-    def test_reorder(self, mock_create_column, mock_delete_column, mock_get_columns):
+    def test_reorder(self, mock_create_columns, mock_delete_column, mock_get_columns):
         user = UserFactory()
         col1 = KanbanColumnFactory(user=user, column_number=0)
         col2 = KanbanColumnFactory(user=user, column_number=1)
@@ -98,7 +110,7 @@ class UpdateColumnsTests(TestCase):
         self.assertEqual(result_columns[2].id, col2.id)
         self.assertEqual(len(query.get_columns(user.id)), 3)
 
-    def test_out_of_bounds_reorder(self, mock_create_column, mock_delete_column, mock_get_columns):
+    def test_out_of_bounds_reorder(self, mock_create_columns, mock_delete_column, mock_get_columns):
         user = UserFactory()
         col1 = KanbanColumnFactory(user=user, column_number=0)
         col2 = KanbanColumnFactory(user=user, column_number=1)
@@ -151,7 +163,7 @@ class UpdateColumnsTests(TestCase):
         self.assertEqual(result_columns[2].id, col1.id)
         self.assertEqual(len(query.get_columns(user.id)), 3)
 
-    def test_delete(self, mock_create_column, mock_delete_column, mock_get_columns):
+    def test_delete(self, mock_create_columns, mock_delete_column, mock_get_columns):
         user = UserFactory()
         col1 = KanbanColumnFactory(user=user, column_number=0)
         col2 = KanbanColumnFactory(user=user, column_number=1)
@@ -176,7 +188,7 @@ class UpdateColumnsTests(TestCase):
         self.assertEqual(result_columns[1].id, col3.id)
         self.assertEqual(len(query.get_columns(user.id)), 2)
 
-    def test_create(self, mock_create_column, mock_delete_column, mock_get_columns):
+    def test_create(self, mock_create_columns, mock_delete_column, mock_get_columns):
         user = UserFactory()
 
         col1 = KanbanColumnFactory(user=user, column_number=0)
@@ -198,7 +210,7 @@ class UpdateColumnsTests(TestCase):
         self.assertEqual(result_columns[0].id, col1.id)
         self.assertEqual(len(query.get_columns(user.id)), 1)
 
-    def test_nonexistent_user(self, mock_create_column, mock_delete_column, mock_get_columns):
+    def test_nonexistent_user(self, mock_create_columns, mock_delete_column, mock_get_columns):
         mock_get_columns.side_effect = ObjectDoesNotExist("Nonexistant User")
         # User doesn't exist
         with self.assertRaises(ObjectDoesNotExist):
@@ -210,7 +222,7 @@ class UpdateColumnsTests(TestCase):
                 ],
             )
 
-    def test_empty_payload(self, mock_create_column, mock_delete_column, mock_get_columns):
+    def test_empty_payload(self, mock_create_columns, mock_delete_column, mock_get_columns):
         mock_get_columns.return_value = KanbanColumn.objects.none()
 
         user = UserFactory()
@@ -227,7 +239,7 @@ class UpdateColumnsTests(TestCase):
         self.assertEqual(len(result_columns), 0)
         self.assertEqual(len(query.get_columns(user.id)), 0)
 
-    def test_validation(self, mock_create_column, mock_delete_column, mock_get_columns):
+    def test_validation(self, mock_create_columns, mock_delete_column, mock_get_columns):
         user = UserFactory()
         mock_get_columns.side_effect = ValueError("Error")
         with self.assertRaises(ValueError):
@@ -254,3 +266,23 @@ class UpdateColumnsTests(TestCase):
                     },
                 ],
             )
+
+
+class UpdateColumnsQueryCountTests(TestCase):
+    def update_columns_queries(self, column_count):
+        user = UserFactory()
+        existing = [KanbanColumnFactory(user=user, column_number=i) for i in range(column_count)]
+        # Rename and reorder the first half, delete the rest, and add as many new columns
+        payload = [
+            {"id": column.id, "name": "Renamed", "column_number": column_count - i}
+            for i, column in enumerate(existing[: column_count // 2])
+        ]
+        payload += [{"id": -i - 1, "name": "New", "column_number": i} for i in range(column_count)]
+
+        with CaptureQueriesContext(connection) as queries:
+            columns = business.update_columns(user.id, payload)
+        self.assertEqual(len(columns), column_count // 2 + column_count)
+        return len(queries)
+
+    def test_query_count_constant(self):
+        self.assertEqual(self.update_columns_queries(2), self.update_columns_queries(10))
@@ -1,36 +1,9 @@
 from django.test import TestCase
-from django.core.exceptions import ObjectDoesNotExist
 from column import query
 from account.tests.factories import UserFactory
 from column.tests.factories import KanbanColumnFactory
 
 
-class CreateColumnTests(TestCase):
-    def test_create_column(self):
-        user = UserFactory()
-
-        new_column = query.create_column(user.id, "New column", 0)
-        newer_column = query.create_column(user.id, "Newer column", 1)
-
-        # Column numbers should be in order of creation by default
-        self.assertEqual(new_column.column_number, 0)
-        self.assertEqual(newer_column.column_number, 1)
-
-    def test_duplicate_column_names(self):
-        user = UserFactory()
-        query.create_column(user.id, "New column", 0)
-        query.create_column(user.id, "Newer column", 1)
-
-        # Duplicate names are allowed
-        duplicate_name_column = query.create_column(user.id, "Newer column", 2)
-        self.assertEqual(duplicate_name_column.column_number, 2)
-
-    def test_invalid_create_column(self):
-        # User doesn't exist
-        with self.assertRaises(ObjectDoesNotExist):
-            query.create_column(-1, "New column", 0)
-
-
 class GetColumnsTests(TestCase):
     def test_get_columns(self):
         user = UserFactory()
@@ -366,3 +366,26 @@ class UpdateColumnsTests(TestCase):
         response_columns = json.loads(response.content)["columns"]
         self.assertEqual(len(response_columns), 0)
         self.assertEqual(len(query.get_columns(user.id)), 0)
+
+
+class GetColumnsConditionalTests(TestCase):
+    def post(self, user, **headers):
+        return self.client.post(
+            reverse("get_columns"), json.dumps({"user_id": user.id}), content_type="application/json", **headers
+        )
+
+    def test_not_modified_until_columns_change(self):
+        user = UserFactory()
+        column = KanbanColumnFactory(user=user)
+        etag = self.post(user)["ETag"]
+
+        with patch("column.business.get_columns") as mock_get_columns:
+            response = self.post(user, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        mock_get_columns.assert_not_called()
+
+        business.update_columns(user.id, [{"id": column.id, "name": "Renamed", "column_number": 0}])
+        response = self.post(user, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(json.loads(response.content)["columns"][0]["name"], "Renamed")
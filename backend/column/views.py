@@ -4,15 +4,17 @@ Account views
 API-layer for account related operations.
 """
 import logging
-from django.http import HttpRequest, JsonResponse
+from django.http import HttpRequest
 from django.views.decorators.http import require_POST
-from jamco.helper import read_request
+from jamco.helper import read_request, JsonResponse, conditional_json
 from . import business
+from board import business as board_business
 
 logger = logging.getLogger(__name__)
 
 
 @require_POST
+@conditional_json(lambda body: board_business.get_board_etag("columns", body["user_id"]))
 def get_columns(request: HttpRequest):
     """
     Gets all of the columns for a given user
@@ -20,7 +22,7 @@ def get_columns(request: HttpRequest):
 
     body = read_request(request)
     user_id = body["user_id"]
-    logger.debug(f"get_columns: {user_id}")
+    logger.debug("get_columns: %s", user_id)
 
     try:
         columns = business.get_columns(user_id)
@@ -42,7 +44,7 @@ def update_columns(request: HttpRequest):
     body = read_request(request)
     user_id = body["user_id"]
     payload = body["payload"]
-    logger.debug(f"update_columns: {user_id}, {payload}")
+    logger.debug("update_columns: %s, %s", user_id, payload)
 
     try:
         columns = business.update_columns(user_id, payload)
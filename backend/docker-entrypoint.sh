@@ -4,4 +4,13 @@ echo "Starting django in 5 seconds..."
 sleep 5
 
 python manage.py migrate
-python manage.py runserver 0.0.0.0:8000
\ No newline at end of file
+
+# Production runs under gunicorn (see gunicorn.conf.py), development keeps the auto-reloading dev server.
+# SERVER_MODE=gunicorn|runserver overrides the choice, e.g. to load test the production server locally.
+SERVER_MODE=${SERVER_MODE:-$([ "${PROD:-0}" = "1" ] && echo gunicorn || echo runserver)}
+
+if [ "$SERVER_MODE" = "gunicorn" ]; then
+    exec gunicorn -c gunicorn.conf.py
+else
+    exec python manage.py runserver 0.0.0.0:8000
+fi
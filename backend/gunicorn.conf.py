@@ -0,0 +1,28 @@
+"""
+Gunicorn config for serving jamco in production.
+
+Every setting can be overridden through the environment, e.g. GUNICORN_WORKERS=8.
+Send SIGHUP to the master process for a graceful reload of the workers.
+"""
+import multiprocessing
+import os
+
+wsgi_app = "jamco.wsgi:application"
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+
+# gthread workers: each worker process serves `threads` requests concurrently
+worker_class = "gthread"
+workers = int(os.getenv("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.getenv("GUNICORN_THREADS", 4))
+
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", 5))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 30))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", 30))
+
+# Recycle workers periodically so slow leaks can't build up; jitter avoids restarting them all at once
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", 1000))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", 100))
+
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", "-")
+errorlog = "-"
+loglevel = os.getenv("GUNICORN_LOG_LEVEL", "info")
@@ -0,0 +1,97 @@
+"""
+Read-through cache for per-user data, on top of django's cache framework (see CACHES in settings).
+
+Each cached value is stored under the user's current generation for that data, e.g. "columns:12:<generation>".
+Writes bump the generation instead of deleting values, so a reader that loaded its data before a write
+committed can only ever store it under a generation that is no longer read.
+
+Generations only retire values for the processes sharing the backend, so settings only allows the in-process
+locmem backend when a single process serves requests. Data with a version in the database (e.g. the board
+version) can also be stored along with it, and is then only read back for that same version.
+"""
+import threading
+import time
+from collections import Counter
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+# Names of the cached per-user data
+MINIMUM_JOBS = "minimum_jobs"
+COLUMNS = "columns"
+PRIVACIES = "privacies"
+FRIEND_IDS = "friend_ids"
+TOKEN_USERS = "token_users"
+
+_MISSING = object()
+
+# Per-process hit/miss counters, keyed by e.g. "columns.hits"
+_stats = Counter()
+_stats_lock = threading.Lock()
+
+
+def _count(name: str, outcome: str) -> None:
+    with _stats_lock:
+        _stats[f"{name}.{outcome}"] += 1
+
+
+def get_stats() -> dict:
+    with _stats_lock:
+        return dict(_stats)
+
+
+def reset_stats() -> None:
+    with _stats_lock:
+        _stats.clear()
+
+
+def _generation_key(name: str, user_id) -> str:
+    return f"{name}:{user_id}:generation"
+
+
+def _generation(name: str, user_id):
+    key = _generation_key(name, user_id)
+    generation = cache.get(key)
+    if generation is None:
+        # Start from the clock rather than 0, so an evicted generation can't come back and
+        # revive values stored under it
+        cache.add(key, time.time_ns(), timeout=None)
+        generation = cache.get(key)
+    return generation
+
+
+def get_or_load(name: str, user_id, loader, version=None):
+    """
+    Returns the cached `name` data for the user, calling loader() to produce it on a miss.
+    When a version is given, values cached for any other version are misses. It has to be read before loader() runs.
+    Loaded values are only stored once the surrounding transaction commits.
+    """
+    generation = _generation(name, user_id)
+    key = f"{name}:{user_id}:{generation}"
+    entry = cache.get(key, _MISSING) if generation is not None else _MISSING
+    if entry is not _MISSING and entry[0] == version:
+        _count(name, "hits")
+        return entry[1]
+
+    _count(name, "misses")
+    value = loader()
+    if generation is not None:
+        transaction.on_commit(lambda: cache.set(key, (version, value), timeout=settings.USER_CACHE_TIMEOUT))
+    return value
+
+
+def invalidate(name: str, user_id) -> None:
+    """
+    Retires the user's cached `name` data, both now and once the surrounding transaction commits
+    (readers in between still see the old rows, and may store them under the current generation).
+    """
+
+    def _bump():
+        try:
+            cache.incr(_generation_key(name, user_id))
+        except ValueError:
+            # No generation yet, so nothing is cached
+            pass
+
+    _bump()
+    transaction.on_commit(_bump)
@@ -1,9 +1,101 @@
+import functools
+import hashlib
 import json
-from django.http import HttpRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpRequest, HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags, quote_etag
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional, fall back to the stdlib codec
+    orjson = None
+
+# Datetimes are handed to DjangoJSONEncoder, so both codecs format them exactly like django's JsonResponse
+_ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS if orjson else None
+_django_encoder = DjangoJSONEncoder()
+
+
+def json_dumps(data) -> bytes:
+    """
+    Encodes data as json, using orjson when it is installed.
+    """
+    if orjson is not None:
+        return orjson.dumps(data, default=_django_encoder.default, option=_ORJSON_OPTIONS)
+    return json.dumps(data, cls=DjangoJSONEncoder).encode("utf-8")
+
+
+def json_loads(data):
+    """
+    Decodes json from bytes or str, using orjson when it is installed.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class JsonResponse(HttpResponse):
+    """
+    Drop-in replacement for django's JsonResponse, encoding the payload with json_dumps.
+    """
+
+    def __init__(self, data, safe=True, **kwargs):
+        if safe and not isinstance(data, dict):
+            raise TypeError("In order to allow non-dict objects to be serialized set the safe parameter to False.")
+        kwargs.setdefault("content_type", "application/json")
+        super().__init__(content=json_dumps(data), **kwargs)
 
 
 def read_request(request: HttpRequest):
     """
     Reads the request body and returns it json decoded.
+    The decoded body is kept on the request, so requires_login and the view share a single parse.
     """
-    return json.loads(request.body.decode("utf-8"))
+    if not hasattr(request, "_json_body"):
+        request._json_body = json_loads(request.body)
+    return request._json_body
+
+
+def _etag_matches(request: HttpRequest, etag: str) -> bool:
+    if_none_match = parse_etags(request.META.get("HTTP_IF_NONE_MATCH", ""))
+    return etag in if_none_match or "*" in if_none_match
+
+
+def _not_modified(etag: str) -> HttpResponse:
+    response = HttpResponseNotModified()
+    response["ETag"] = etag
+    response["Cache-Control"] = "private, no-cache"
+    return response
+
+
+def conditional_json(version_etag=None):
+    """
+    Lets clients revalidate a read-only POST json view by sending its last ETag in If-None-Match.
+    version_etag(body) returns a cheap tag for the current data (e.g. from a version counter); when it matches,
+    the view isn't run at all. Without it, or when it returns None, the ETag is a hash of the response, which only
+    saves the transfer.
+    Goes below requires_login, so only authenticated requests get this far.
+    """
+
+    def _inner(wrapped_view):
+        @functools.wraps(wrapped_view)
+        def _decorator(request, *args, **kwargs):
+            etag = version_etag(read_request(request)) if version_etag else None
+            if etag is not None:
+                etag = quote_etag(etag)
+            if etag and _etag_matches(request, etag):
+                return _not_modified(etag)
+
+            response = wrapped_view(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            if etag is None:
+                etag = quote_etag(hashlib.sha256(response.content).hexdigest()[:32])
+                if _etag_matches(request, etag):
+                    return _not_modified(etag)
+            response["ETag"] = etag
+            response["Cache-Control"] = "private, no-cache"
+            return response
+
+        return _decorator
+
+    return _inner
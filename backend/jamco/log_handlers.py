@@ -0,0 +1,46 @@
+import atexit
+import sys
+from logging import StreamHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from queue import SimpleQueue
+
+
+class _QueuedHandler(QueueHandler):
+    """
+    Non-blocking log handler.
+    Records are queued by the logging thread and written by `handler` on a background listener thread.
+    """
+
+    def __init__(self, handler):
+        super().__init__(SimpleQueue())
+        self.handler = handler
+        self.listener = QueueListener(self.queue, self.handler)
+        self.listener.start()
+        # flush whatever is still queued when the process exits
+        atexit.register(self.close)
+
+    def close(self):
+        if self.listener._thread is not None:
+            self.listener.stop()
+        self.handler.close()
+        super().close()
+
+
+class QueuedRotatingFileHandler(_QueuedHandler):
+    """
+    Writes to a size-rotated file. Rotation isn't coordinated between processes, so only one process may use a file.
+    """
+
+    def __init__(self, filename, maxBytes=0, backupCount=0, encoding=None):
+        super().__init__(
+            RotatingFileHandler(filename, maxBytes=maxBytes, backupCount=backupCount, encoding=encoding, delay=True)
+        )
+
+
+class QueuedStreamHandler(_QueuedHandler):
+    """
+    Writes to stdout, which any number of processes can share.
+    """
+
+    def __init__(self):
+        super().__init__(StreamHandler(sys.stdout))
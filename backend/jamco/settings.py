@@ -9,7 +9,10 @@ https://docs.djangoproject.com/en/4.1/topics/settings/
 For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.1/ref/settings/
 """
+from corsheaders.defaults import default_headers
+from django.core.exceptions import ImproperlyConfigured
 from dotenv import load_dotenv
+import multiprocessing
 import os
 from pathlib import Path
 
@@ -41,6 +44,7 @@ INSTALLED_APPS = [
     "account",
     "job",
     "column",
+    "board",
     "django.contrib.admin",
     "django.contrib.auth",
     "django.contrib.contenttypes",
@@ -76,8 +80,15 @@ else:
     ]
     CSRF_TRUSTED_ORIGINS = ["https://jamco.pro", "http://jamco.pro"]
 
+# Read endpoints can be revalidated with If-None-Match (see jamco.helper.conditional_json)
+CORS_ALLOW_HEADERS = (*default_headers, "if-none-match")
+CORS_EXPOSE_HEADERS = ["ETag"]
+
 ROOT_URLCONF = "jamco.urls"
 
+# Serve index.html from a pre-rendered, precompressed copy instead of rendering the template per request
+CACHE_SPA_SHELL = bool(int(os.getenv("CACHE_SPA_SHELL", int(PROD))))
+
 TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
@@ -108,9 +119,75 @@ DATABASES = {
         "PASSWORD": os.getenv("POSTGRES_PASSWORD"),
         "HOST": os.getenv("POSTGRES_HOST"),
         "PORT": os.getenv("POSTGRES_PORT"),
+        # Keep connections open between requests instead of reconnecting every time,
+        # and make sure a reused connection is still alive before handing it out
+        "CONN_MAX_AGE": int(os.getenv("POSTGRES_CONN_MAX_AGE", 60)),
+        "CONN_HEALTH_CHECKS": True,
     }
 }
 
+# POSTGRES_POOL_MODE=pgbouncer points django at a transaction-pooling pgbouncer
+# (see the `pool` profile in docker-compose.yml) instead of postgres itself
+POSTGRES_POOL_MODE = os.getenv("POSTGRES_POOL_MODE", "")
+if POSTGRES_POOL_MODE == "pgbouncer":
+    # Server-side cursors don't survive transaction pooling
+    DATABASES["default"]["DISABLE_SERVER_SIDE_CURSORS"] = True
+
+# Decrypted auth tokens are kept in a per-process LRU, so requires_login doesn't decrypt them on every request
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", 1024))
+
+# Deleted board items are remembered for this many board versions, clients that synced longer ago get the whole board
+BOARD_DELETION_RETENTION = int(os.getenv("BOARD_DELETION_RETENTION", 1000))
+
+# Number of processes serving requests: gunicorn's workers in production (see gunicorn.conf.py and
+# docker-entrypoint.sh), a single one under the dev server
+SERVER_MODE = os.getenv("SERVER_MODE", "gunicorn" if PROD else "runserver")
+SERVER_PROCESSES = (
+    int(os.getenv("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1)) if SERVER_MODE == "gunicorn" else 1
+)
+
+# Cache backend for per-user reads (see jamco/cache.py):
+# "locmem" (in-process LRU), "redis", "memcached", or "dummy" (no caching, the default for tests).
+# A write only retires cached values for the processes sharing the backend, so locmem is only allowed with a
+# single server process. Otherwise the default is redis when CACHE_LOCATION is set, and no caching without it.
+CACHE_LOCATION = os.getenv("CACHE_LOCATION")
+if IS_TEST:
+    _default_cache_backend = "dummy"
+elif SERVER_PROCESSES == 1:
+    _default_cache_backend = "locmem"
+else:
+    _default_cache_backend = "redis" if CACHE_LOCATION else "dummy"
+CACHE_BACKEND = os.getenv("CACHE_BACKEND") or _default_cache_backend
+if CACHE_BACKEND == "locmem" and SERVER_PROCESSES > 1:
+    raise ImproperlyConfigured(
+        f"CACHE_BACKEND=locmem can't be shared by {SERVER_PROCESSES} server processes, use redis or memcached"
+    )
+if CACHE_BACKEND == "redis":
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": CACHE_LOCATION or "redis://127.0.0.1:6379",
+        }
+    }
+elif CACHE_BACKEND == "memcached":
+    # Needs pymemcache installed
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.memcached.PyMemcacheCache",
+            "LOCATION": CACHE_LOCATION or "127.0.0.1:11211",
+        }
+    }
+elif CACHE_BACKEND == "dummy":
+    CACHES = {"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "OPTIONS": {"MAX_ENTRIES": int(os.getenv("CACHE_MAX_ENTRIES", 10000))},
+        }
+    }
+USER_CACHE_TIMEOUT = int(os.getenv("USER_CACHE_TIMEOUT", 300))
+
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
 
@@ -152,22 +229,47 @@ STATIC_URL = "static/"
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# Levels can be set per environment, e.g. LOG_LEVEL=WARNING.
+# Records are written by a background thread, so logging never blocks a request. A single server process writes
+# them to a size-rotated debug.log. Several gunicorn workers would each rotate that file on their own and lose
+# lines, so they log to stdout instead, next to gunicorn's own logs.
+LOG_LEVEL = os.getenv("LOG_LEVEL", "DEBUG" if DEBUG else "INFO")
+
+if SERVER_PROCESSES == 1:
+    _log_handler = {
+        "class": "jamco.log_handlers.QueuedRotatingFileHandler",
+        "filename": BASE_DIR / "debug.log",
+        "maxBytes": int(os.getenv("LOG_FILE_MAX_BYTES", 10 * 1024 * 1024)),
+        "backupCount": int(os.getenv("LOG_FILE_BACKUP_COUNT", 5)),
+    }
+else:
+    _log_handler = {"class": "jamco.log_handlers.QueuedStreamHandler"}
+
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
+    "formatters": {
+        "default": {
+            "format": "%(asctime)s %(levelname)s %(name)s: %(message)s",
+        },
+    },
     "handlers": {
-        "file": {
-            "level": "DEBUG",
-            "class": "logging.FileHandler",
-            "filename": BASE_DIR / "debug.log",
+        "default": {
+            "level": LOG_LEVEL,
+            "formatter": "default",
+            **_log_handler,
         },
     },
     "loggers": {
         "": {
-            "handlers": ["file"],
-            "level": "DEBUG",
+            "handlers": ["default"],
+            "level": LOG_LEVEL,
             "propagate": True,
         },
+        # SQL queries are logged at DEBUG (dev only), DB_LOG_LEVEL=INFO silences them
+        "django.db.backends": {
+            "level": os.getenv("DB_LOG_LEVEL", LOG_LEVEL),
+        },
     },
 }
 
@@ -188,3 +290,6 @@ DJANGO_VITE_DEV_MODE = DEBUG
 VITE_APP_DIR = os.path.join("static")
 
 STATIC_ROOT = os.path.join(BASE_DIR, "static/")
+
+# collectstatic writes .gz/.br copies of text assets, served by jamco.views.serve_static
+STATICFILES_STORAGE = "jamco.storage.CompressedStaticFilesStorage"
@@ -0,0 +1,49 @@
+import gzip
+import os
+from django.contrib.staticfiles.storage import StaticFilesStorage
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional, gzip is always available
+    brotli = None
+
+# Text assets worth compressing; images and fonts are already compressed
+COMPRESSIBLE_EXTENSIONS = (".js", ".mjs", ".css", ".html", ".json", ".map", ".svg", ".txt", ".xml")
+
+
+def compress_file(path: str) -> list[str]:
+    """
+    Writes .gz (and .br when brotli is installed) copies of path next to it.
+    Returns the paths written.
+    """
+    with open(path, "rb") as fd:
+        content = fd.read()
+
+    written = []
+    variants = [(".gz", lambda data: gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        variants.append((".br", brotli.compress))
+    for suffix, compress in variants:
+        compressed = compress(content)
+        # Not worth serving a compressed variant that isn't smaller
+        if len(compressed) >= len(content):
+            continue
+        with open(path + suffix, "wb") as fd:
+            fd.write(compressed)
+        written.append(path + suffix)
+    return written
+
+
+class CompressedStaticFilesStorage(StaticFilesStorage):
+    """
+    Static files storage that precompresses text assets during collectstatic,
+    so jamco.views.serve_static can send them without compressing per request.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        if dry_run:
+            return
+        for name in paths:
+            if name.endswith(COMPRESSIBLE_EXTENSIONS):
+                compress_file(os.path.join(self.location, name))
+                yield name, name, True
@@ -0,0 +1,123 @@
+from django.test import TestCase, override_settings
+from django.core.cache import cache
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.cache.backends.locmem import LocMemCache
+from jamco import cache as user_cache
+from unittest.mock import patch
+import tempfile
+
+
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "user-cache-tests"}}
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class UserCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        user_cache.reset_stats()
+        self.loads = 0
+
+    def load(self):
+        self.loads += 1
+        return ["column"]
+
+    def test_read_through(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(user_cache.get_or_load(user_cache.COLUMNS, 1, self.load), ["column"])
+        self.assertEqual(user_cache.get_or_load(user_cache.COLUMNS, 1, self.load), ["column"])
+        self.assertEqual(self.loads, 1)
+        self.assertEqual(user_cache.get_stats(), {"columns.misses": 1, "columns.hits": 1})
+
+        # Other users and other data are cached separately
+        user_cache.get_or_load(user_cache.COLUMNS, 2, self.load)
+        user_cache.get_or_load(user_cache.PRIVACIES, 1, self.load)
+        self.assertEqual(self.loads, 3)
+
+    def test_invalidate(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            user_cache.get_or_load(user_cache.COLUMNS, 1, self.load)
+            user_cache.get_or_load(user_cache.COLUMNS, 2, self.load)
+        user_cache.invalidate(user_cache.COLUMNS, 1)
+
+        user_cache.get_or_load(user_cache.COLUMNS, 1, self.load)
+        user_cache.get_or_load(user_cache.COLUMNS, 2, self.load)
+        self.assertEqual(self.loads, 3)
+
+    def test_not_stored_before_commit(self):
+        user_cache.get_or_load(user_cache.COLUMNS, 1, self.load)
+        user_cache.get_or_load(user_cache.COLUMNS, 1, self.load)
+        self.assertEqual(self.loads, 2)
+
+    def test_write_during_load(self):
+        def load_then_write():
+            # A write commits after this reader loaded the old data, but before it stores it
+            value = self.load()
+            user_cache.invalidate(user_cache.COLUMNS, 1)
+            return value
+
+        with self.captureOnCommitCallbacks(execute=True):
+            user_cache.get_or_load(user_cache.COLUMNS, 1, load_then_write)
+        # The old data was stored under a retired generation, so it's never read
+        user_cache.get_or_load(user_cache.COLUMNS, 1, self.load)
+        self.assertEqual(self.loads, 2)
+
+
+class MultiWorkerCacheTests(TestCase):
+    """
+    Every worker process has its own cache instance. Two file based caches over the same directory stand in for a
+    shared backend like redis, two locmem caches for per-process ones.
+    """
+
+    def setUp(self):
+        self.loads = 0
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.shared = [FileBasedCache(directory.name, {}) for _ in range(2)]
+        self.local = [LocMemCache(f"worker-{worker}", {}) for worker in range(2)]
+        for worker_cache in self.local:
+            worker_cache.clear()
+
+    def load(self):
+        self.loads += 1
+        return ["column"]
+
+    def get_or_load(self, worker_cache, version=None):
+        with patch("jamco.cache.cache", worker_cache), self.captureOnCommitCallbacks(execute=True):
+            return user_cache.get_or_load(user_cache.COLUMNS, 1, self.load, version=version)
+
+    def invalidate(self, worker_cache):
+        with patch("jamco.cache.cache", worker_cache), self.captureOnCommitCallbacks(execute=True):
+            user_cache.invalidate(user_cache.COLUMNS, 1)
+
+    def test_shared_backend(self):
+        worker_a, worker_b = self.shared
+        self.get_or_load(worker_a)
+        self.get_or_load(worker_b)
+        self.assertEqual(self.loads, 1)
+
+        # A write handled by one worker retires the value for the other
+        self.invalidate(worker_a)
+        self.get_or_load(worker_b)
+        self.assertEqual(self.loads, 2)
+
+    def test_per_process_backend(self):
+        worker_a, worker_b = self.local
+        self.get_or_load(worker_a)
+        self.get_or_load(worker_b)
+        self.invalidate(worker_a)
+
+        # The other worker never sees the write, which is why locmem is only allowed for a single process
+        self.get_or_load(worker_b)
+        self.assertEqual(self.loads, 2)
+
+    def test_versioned_per_process_backend(self):
+        worker_a, worker_b = self.local
+        self.get_or_load(worker_a, version=1)
+        self.get_or_load(worker_b, version=1)
+        self.invalidate(worker_a)
+
+        # Values cached for an older version are misses, whichever worker stored them
+        self.get_or_load(worker_b, version=2)
+        self.assertEqual(self.loads, 3)
+        self.get_or_load(worker_b, version=2)
+        self.assertEqual(self.loads, 3)
@@ -0,0 +1,90 @@
+from django.test import TestCase, RequestFactory
+from django.core.serializers.json import DjangoJSONEncoder
+from unittest.mock import patch
+import json
+from jamco.helper import read_request, json_loads, json_dumps, JsonResponse, conditional_json
+from datetime import date, datetime, timezone
+
+
+class ReadRequestTests(TestCase):
+    def test_read_request_parses_once(self):
+        request = RequestFactory().post("/", data=json.dumps({"user_id": 1}), content_type="application/json")
+        with patch("jamco.helper.json_loads", wraps=json_loads) as mock_loads:
+            self.assertEqual(read_request(request), {"user_id": 1})
+            self.assertEqual(read_request(request), {"user_id": 1})
+            self.assertEqual(mock_loads.call_count, 1)
+
+
+class JsonCodecTests(TestCase):
+    payload = {
+        "birthday": date(2023, 2, 12),
+        "sent": datetime(2023, 3, 3, 1, 28, 2, 710196, tzinfo=timezone.utc),
+        "friends": [{"id": 1, "first_name": "Rob"}],
+        1: None,
+    }
+
+    def test_json_dumps_matches_django(self):
+        # Dates and datetimes are formatted the same way django's own encoder does
+        self.assertEqual(
+            json.loads(json_dumps(self.payload)), json.loads(json.dumps(self.payload, cls=DjangoJSONEncoder))
+        )
+
+    @patch("jamco.helper.orjson", None)
+    def test_json_dumps_stdlib_fallback(self):
+        self.assertEqual(json_dumps(self.payload), json.dumps(self.payload, cls=DjangoJSONEncoder).encode("utf-8"))
+        self.assertEqual(json_loads(b'{"user_id": 1}'), {"user_id": 1})
+
+    def test_json_response(self):
+        response = JsonResponse(status=400, data={"error": "Error"})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(json.loads(response.content), {"error": "Error"})
+
+        with self.assertRaises(TypeError):
+            JsonResponse([1, 2, 3])
+
+
+class ConditionalJsonTests(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.calls = 0
+
+    def view(self, request):
+        self.calls += 1
+        return JsonResponse({"columns": [1, 2, 3]})
+
+    def post(self, view, if_none_match=None):
+        headers = {"HTTP_IF_NONE_MATCH": if_none_match} if if_none_match else {}
+        request = self.factory.post("/", data=json.dumps({"user_id": 1}), content_type="application/json", **headers)
+        return view(request)
+
+    def test_content_etag(self):
+        view = conditional_json()(self.view)
+        response = self.post(view)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Cache-Control"], "private, no-cache")
+
+        not_modified = self.post(view, response["ETag"])
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.content, b"")
+        self.assertEqual(not_modified["ETag"], response["ETag"])
+
+        self.assertEqual(self.post(view, '"stale"').status_code, 200)
+
+    def test_version_etag(self):
+        view = conditional_json(lambda body: f"columns-{body['user_id']}-5")(self.view)
+        response = self.post(view)
+        self.assertEqual(response["ETag"], '"columns-1-5"')
+        self.assertEqual(self.calls, 1)
+
+        # A matching version answers without running the view
+        self.assertEqual(self.post(view, '"columns-1-5"').status_code, 304)
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(self.post(view, '"columns-1-4"').status_code, 200)
+        self.assertEqual(self.calls, 2)
+
+    def test_errors_not_tagged(self):
+        view = conditional_json()(lambda request: JsonResponse(status=400, data={"error": "Error"}))
+        response = self.post(view)
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.has_header("ETag"))
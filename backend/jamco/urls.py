@@ -14,14 +14,13 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.contrib import admin
-from django.urls import path
-from django.conf import settings
-from django.conf.urls.static import static
+from django.urls import path, re_path
 
 from account import views as account_views
+from board import views as board_views
 from column import views as column_views
 from job import views as job_views
-from .views import index
+from .views import index, serve_static
 
 urlpatterns = [
     path("", index),
@@ -71,4 +70,7 @@ urlpatterns = [
     ),
     path("job/api/create_review", job_views.create_review, name="create_review"),
     path("job/api/get_reviews_for_user", job_views.get_reviews_for_user, name="get_reviews_for_user"),
-] + static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
+    path("board/api/get_board", board_views.get_board, name="get_board"),
+    path("board/api/get_board_changes", board_views.get_board_changes, name="get_board_changes"),
+    re_path(r"^static/(?P<path>.*)$", serve_static, name="serve_static"),
+]
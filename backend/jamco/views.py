@@ -1,13 +1,89 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+import time
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse
 from django.shortcuts import render
+from django.template.loader import render_to_string
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils._os import safe_join
+from django.utils.http import http_date
 from django.views.decorators.csrf import ensure_csrf_cookie
 from account.models import User
+from account.templatetags.render_vite_bundle import render_vite_bundle
 
 from jamco import settings
 
 from logging import getLogger
 
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional, gzip is always available
+    brotli = None
+
 logger = getLogger(__name__)
 
+_ACCEPTS_BR = re.compile(r"\bbr\b")
+_ACCEPTS_GZIP = re.compile(r"\bgzip\b")
+# vite puts a content hash in the name of every file it writes to dist/assets, e.g. index-3b8daa75.js.
+# Everything else (including vite's manifest.json) keeps its name across builds.
+_HASHED_ASSETS_DIR = "dist/assets/"
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class _Shell:
+    """
+    The pre-rendered index.html, along with its compressed variants and validators.
+    """
+
+    def __init__(self, bundle_tags):
+        # The frontend reads the csrf token from its cookie (issued by ensure_csrf_cookie), so the shell doesn't
+        # depend on the request and can be rendered once
+        html = render_to_string("index.html", {"PROD": settings.PROD}).encode("utf-8")
+        self.bundle_tags = bundle_tags
+        self.variants = {"identity": html, "gzip": gzip.compress(html, compresslevel=9)}
+        if brotli is not None:
+            self.variants["br"] = brotli.compress(html)
+        self.digest = hashlib.sha256(html).hexdigest()[:32]
+        self.last_modified = int(time.time())
+
+
+_shell = None
+
+
+def _get_shell() -> _Shell:
+    global _shell
+    # The only part of the shell that can change at runtime is the vite bundle (on a new build)
+    bundle_tags = render_vite_bundle()
+    if _shell is None or _shell.bundle_tags != bundle_tags:
+        _shell = _Shell(bundle_tags)
+    return _shell
+
+
+def _shell_response(request) -> HttpResponse:
+    shell = _get_shell()
+    accept_encoding = request.META.get("HTTP_ACCEPT_ENCODING", "")
+    if "br" in shell.variants and _ACCEPTS_BR.search(accept_encoding):
+        encoding = "br"
+    elif _ACCEPTS_GZIP.search(accept_encoding):
+        encoding = "gzip"
+    else:
+        encoding = "identity"
+
+    response = HttpResponse(shell.variants[encoding], content_type="text/html; charset=utf-8")
+    if encoding != "identity":
+        response["Content-Encoding"] = encoding
+    patch_vary_headers(response, ("Accept-Encoding",))
+    # each encoding is a different representation, so it gets its own etag
+    etag = f'"{shell.digest}-{encoding}"'
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(shell.last_modified)
+    response["Cache-Control"] = "no-cache"
+    return get_conditional_response(request, etag=etag, last_modified=shell.last_modified, response=response)
+
 
 @ensure_csrf_cookie
 def index(request):
@@ -15,4 +91,90 @@ def index(request):
     if settings.IS_TEST:
         User.objects.filter(google_id="1234567890").delete()
         User.objects.filter(google_id="0987654321").delete()
+    if settings.CACHE_SPA_SHELL:
+        return _shell_response(request)
     return render(request, "index.html")
+
+
+def _parse_range(range_header: str, size: int):
+    """
+    Returns the (start, end) byte positions (inclusive) of a single-range header, or None if it can't be satisfied.
+    """
+    match = _RANGE.match(range_header.strip())
+    if not match or match.group(1) == match.group(2) == "":
+        return None
+    start, end = match.groups()
+    if start == "":
+        # suffix range: the last `end` bytes
+        start, end = max(size - int(end), 0), size - 1
+    else:
+        start, end = int(start), min(int(end), size - 1) if end else size - 1
+    if start > end or start >= size:
+        return None
+    return start, end
+
+
+def serve_static(request, path):
+    """
+    Serves collected static files.
+    Precompressed .br/.gz variants (written by CompressedStaticFilesStorage) are sent when the client accepts them,
+    hashed filenames are cached as immutable, and conditional and range requests are supported.
+    """
+    try:
+        full_path = safe_join(settings.STATIC_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404("Invalid static path")
+    if not os.path.isfile(full_path):
+        raise Http404("Static file not found")
+
+    content_type, _ = mimetypes.guess_type(full_path)
+    content_type = content_type or "application/octet-stream"
+    range_header = request.META.get("HTTP_RANGE")
+
+    # Ranges are always served from the uncompressed file
+    encoding, file_path = "identity", full_path
+    if not range_header:
+        accept_encoding = request.META.get("HTTP_ACCEPT_ENCODING", "")
+        if _ACCEPTS_BR.search(accept_encoding) and os.path.isfile(full_path + ".br"):
+            encoding, file_path = "br", full_path + ".br"
+        elif _ACCEPTS_GZIP.search(accept_encoding) and os.path.isfile(full_path + ".gz"):
+            encoding, file_path = "gzip", full_path + ".gz"
+
+    stat = os.stat(file_path)
+    etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+    last_modified = int(stat.st_mtime)
+
+    response = HttpResponse(content_type=content_type)
+    if path.startswith(_HASHED_ASSETS_DIR):
+        response["Cache-Control"] = "public, max-age=31536000, immutable"
+    else:
+        response["Cache-Control"] = "public, max-age=0, must-revalidate"
+    patch_vary_headers(response, ("Accept-Encoding",))
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    response["Accept-Ranges"] = "bytes"
+    not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified, response=response)
+    if not_modified is not response:
+        return not_modified
+
+    if range_header:
+        byte_range = _parse_range(range_header, stat.st_size)
+        if byte_range is None:
+            response.status_code = 416
+            response["Content-Range"] = f"bytes */{stat.st_size}"
+            return response
+        start, end = byte_range
+        with open(file_path, "rb") as fd:
+            fd.seek(start)
+            response.content = fd.read(end - start + 1)
+        response.status_code = 206
+        response["Content-Range"] = f"bytes {start}-{end}/{stat.st_size}"
+        return response
+
+    file_response = FileResponse(open(file_path, "rb"), content_type=content_type)
+    del file_response["Content-Disposition"]
+    for header, value in response.items():
+        file_response[header] = value
+    if encoding != "identity":
+        file_response["Content-Encoding"] = encoding
+    return file_response
@@ -3,24 +3,41 @@ Job business
 
 Business logic for job related operations.
 """
+from django.db import transaction
 from .models import Job, ReviewRequest, Review
 from . import query
+from board import query as board_query
+from jamco import cache as user_cache
 
 
-def get_minimum_jobs(in_user: int) -> list[Job]:
-    return query.get_minimum_jobs(in_user)
+def get_minimum_jobs(in_user: int) -> list[dict]:
+    # Tied to the board version like the cached columns
+    return user_cache.get_or_load(
+        user_cache.MINIMUM_JOBS,
+        in_user,
+        lambda: list(query.get_minimum_jobs(in_user)),
+        version=board_query.get_version(in_user),
+    )
 
 
 def get_job_by_id(in_user: int, job_id: int) -> Job:
     return query.get_job_by_id(in_user, job_id)
 
 
+@transaction.atomic
 def create_job(payload: dict) -> Job:
-    return query.create_job(payload)
+    return query.create_job(payload, board_query.bump_version(payload["user_id"]))
 
 
-def update_job(payload: dict) -> None:
-    query.update_job(payload)
+@transaction.atomic
+def update_job(payload: dict) -> int:
+    return query.update_job(payload, board_query.bump_version(payload["user_id"]))
+
+
+@transaction.atomic
+def delete_job(in_user: int, job_id: int) -> None:
+    query.delete_job(in_user, job_id)
+    board_query.record_job_deletions(in_user, board_query.bump_version(in_user), [job_id])
 
 
 def create_review_request(payload: dict) -> ReviewRequest:
@@ -13,6 +13,11 @@ class Job(models.Model):
     cover_letter = models.TextField(null=True)
     deadlines = models.JSONField(encoder=None, null=True)
     type = models.TextField(null=True)
+    # The user's board version when this job last changed
+    version = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        indexes = [models.Index(fields=["user", "version"], name="job_version_idx")]
 
     def to_dict(self):
         return {
@@ -22,8 +27,8 @@ class Job(models.Model):
             "description": self.description,
             "notes": self.notes,
             "cover_letter": self.cover_letter,
-            "kcolumn_id": self.kcolumn.id,
-            "user_id": self.user.id,
+            "kcolumn_id": self.kcolumn_id,
+            "user_id": self.user_id,
             "deadlines": self.deadlines,
             "type": self.type,
         }
@@ -38,9 +43,9 @@ class ReviewRequest(models.Model):
     def to_dict(self):
         return {
             "id": self.id,
-            "job_id": self.job.id,
-            "reviewer_id": self.reviewer.id,
-            "sender_id": self.job.user.id,
+            "job_id": self.job_id,
+            "reviewer_id": self.reviewer_id,
+            "sender_id": self.job.user_id,
             "message": self.message,
             "fulfilled": self.fulfilled,
         }
@@ -55,8 +60,8 @@ class Review(models.Model):
         return {
             "id": self.id,
             "request_id": self.request_id,
-            "job_id": self.request.job.id,
-            "reviewer_id": self.request.reviewer.id,
+            "job_id": self.request.job_id,
+            "reviewer_id": self.request.reviewer_id,
             "response": self.response,
             "completed": self.completed.isoformat() if self.completed else None,
         }
@@ -9,11 +9,16 @@ from django.db.models.query import QuerySet
 from account.models import User
 from column.models import KanbanColumn
 from job.models import Job, ReviewRequest, Review
+from jamco import cache as user_cache
 
 logger = logging.getLogger(__name__)
 
+# Unbounded columns that only the job detail (to_dict) needs. Everything else defers them,
+# so list, permission and delete paths don't pull the wide part of the row.
+HEAVY_JOB_FIELDS = ("description", "notes", "cover_letter", "deadlines")
 
-def create_job(payload: dict) -> Job:
+
+def create_job(payload: dict, version: int = 0) -> Job:
     kcolid = (
         payload["kcolumn_id"]
         if "kcolumn_id" in payload
@@ -31,8 +36,11 @@ def create_job(payload: dict) -> Job:
         notes=payload["notes"] if payload.get("notes") else "",
         cover_letter=payload["cover_letter"] if payload.get("cover_letter") else "",
         deadlines=payload["deadlines"] if payload.get("deadlines") else None,
+        version=version,
     )
-    logger.debug(f"Created Job: {job.to_dict()}")
+    user_cache.invalidate(user_cache.MINIMUM_JOBS, job.user_id)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Created Job: %s", job.to_dict())
     return job
 
 
@@ -40,21 +48,47 @@ def job_exists(job_id: str) -> bool:
     return Job.objects.filter(id=job_id).exists()
 
 
-def update_job(payload: dict) -> None:
-    # raise exception if update fails
-    job = Job.objects.get(id=payload["id"])
+# Payload key -> column to update, accepting both "kcolumn" and "kcolumn_id" style keys for foreign keys.
+# The version is only ever set by the board versioning, never by the payload, and a job can't change owner:
+# user_id only picks the job to update.
+_JOB_UPDATE_FIELDS = {
+    name: field.attname
+    for field in Job._meta.concrete_fields
+    if not field.primary_key and field.name not in ("version", "user")
+    for name in (field.name, field.attname)
+}
+
+
+def update_job(payload: dict, version: int = None) -> int:
+    jobs = Job.objects.filter(id=payload["id"])
+    # Scoping the update to the given user means we know exactly whose cached jobs change
+    owner_id = payload.get("user_id")
+    if owner_id is not None:
+        jobs = jobs.filter(user_id=owner_id)
+    fields = {}
     for key, value in payload.items():
+        if key in ("id", "user_id"):
+            continue
         # If there are invalid keys in the payload (e.g. the frontend misspelled
-        # the name of a field), raise an exception
-        if hasattr(job, key):
-            setattr(job, key, value)
-        else:
+        # the name of a field), raise an exception before anything is written.
+        # A missing job takes precedence, as it did when the row was loaded first.
+        if key not in _JOB_UPDATE_FIELDS:
+            if not jobs.exists():
+                raise Job.DoesNotExist("Job matching query does not exist.")
             raise AttributeError("Job has no attribute " + key)
+        fields[_JOB_UPDATE_FIELDS[key]] = value
+
+    if version is not None:
+        fields["version"] = version
 
-    # Since this is at the end of the func, it'll only execute if an exception
-    # isn't raised. That is, we'll only save changes if the entire payload is
-    # error-free.
-    job.save()
+    # Only the supplied columns are written, without loading the row first
+    if owner_id is None:
+        owner_id = jobs.values_list("user_id", flat=True).first()
+    updated = jobs.update(**fields) if fields else jobs.count()
+    if not updated:
+        raise Job.DoesNotExist("Job matching query does not exist.")
+    user_cache.invalidate(user_cache.MINIMUM_JOBS, owner_id)
+    return updated
 
 
 def get_job_by_id(in_user: int, job_id: int) -> Job:
@@ -74,12 +108,13 @@ def get_minimum_jobs(in_user: int) -> QuerySet:
 
 
 def delete_job(in_user: int, job_id: int):
-    Job.objects.get(id=job_id, user__id=in_user).delete()
+    Job.objects.defer(*HEAVY_JOB_FIELDS).get(id=job_id, user__id=in_user).delete()
+    user_cache.invalidate(user_cache.MINIMUM_JOBS, in_user)
 
 
 def create_review_request(payload: dict):
     return ReviewRequest.objects.create(
-        job=Job.objects.get(id=payload["job_id"]),
+        job=Job.objects.defer(*HEAVY_JOB_FIELDS).get(id=payload["job_id"]),
         reviewer=User.objects.get(id=payload["reviewer_id"]),
         message=payload["message"],
         fulfilled=False,
@@ -91,7 +126,12 @@ def get_review_requests_for_user(payload: dict):
     # (if we just ran the query below with an invalid user id, it would hide the error by returning an empty queryset)
     user = User.objects.get(id=payload["user_id"])
 
-    return ReviewRequest.objects.filter(reviewer=user)
+    # to_dict reads the job's user, so fetch the job alongside each request (without its heavy fields)
+    return (
+        ReviewRequest.objects.filter(reviewer=user)
+        .select_related("job")
+        .defer(*[f"job__{field}" for field in HEAVY_JOB_FIELDS])
+    )
 
 
 def create_review(payload: dict):
@@ -104,4 +144,5 @@ def create_review(payload: dict):
 
 def get_reviews_for_user(payload: dict):
     user = User.objects.get(id=payload["user_id"])
-    return Review.objects.filter(request__job__user=user)
+    # to_dict reads the request's job and reviewer ids, so fetch the request alongside each review
+    return Review.objects.filter(request__job__user=user).select_related("request")
@@ -25,8 +25,10 @@ class UpdateJobTest(TestCase):
     @patch("job.query.update_job")
     def test_update_job(self, mock_update_job):
         mocked_job = JobFactory()
-        business.update_job({"id": mocked_job.id})
-        mock_update_job.assert_called_with({"id": mocked_job.id})
+        payload = {"id": mocked_job.id, "user_id": mocked_job.user.id}
+        business.update_job(payload)
+        # Stamped with the user's next board version
+        mock_update_job.assert_called_with(payload, 1)
 
 
 class GetMinimumJobsTests(TestCase):
@@ -1,5 +1,7 @@
 from django.test import TestCase
 from django.core.exceptions import ObjectDoesNotExist
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from job import query, models
 from job.tests.factories import JobFactory, ReviewRequestFactory
 from account.tests.factories import UserFactory
@@ -48,6 +50,18 @@ class GetOrCreateJobTests(TestCase):
             query.get_job_by_id(999, 999)
 
 
+class JobToDictTests(TestCase):
+    def test_to_dict_query_count(self):
+        job = JobFactory()
+        job = models.Job.objects.get(id=job.id)
+
+        # The column and user ids are already on the row
+        with self.assertNumQueries(0):
+            job_dict = job.to_dict()
+        self.assertEqual(job_dict["kcolumn_id"], job.kcolumn_id)
+        self.assertEqual(job_dict["user_id"], job.user_id)
+
+
 class JobExistsTests(TestCase):
     def test_job_exists(self):
         job = JobFactory()
@@ -70,6 +84,50 @@ class UpdateJobTests(TestCase):
         with self.assertRaises(ObjectDoesNotExist):
             query.update_job({"id": -1, "description": "Manage things and stuff"})
 
+        # Methods and reverse relations aren't fields
+        with self.assertRaises(AttributeError):
+            query.update_job({"id": job.id, "to_dict": "overwritten"})
+
+    def test_update_job_only_supplied_fields(self):
+        job = JobFactory(cover_letter="Dear hiring manager")
+        column = KanbanColumnFactory(user=job.user)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(query.update_job({"id": job.id, "user_id": job.user_id, "kcolumn_id": column.id}), 1)
+        # A single UPDATE that only sets the column
+        self.assertEqual(len(queries), 1)
+        self.assertTrue(queries[0]["sql"].startswith("UPDATE"))
+        self.assertIn("kcolumn_id", queries[0]["sql"])
+        self.assertNotIn("cover_letter", queries[0]["sql"])
+
+        job.refresh_from_db()
+        self.assertEqual(job.kcolumn_id, column.id)
+        self.assertEqual(job.cover_letter, "Dear hiring manager")
+
+    def test_update_job_other_users_job(self):
+        job = JobFactory()
+        with self.assertRaises(ObjectDoesNotExist):
+            query.update_job({"id": job.id, "user_id": UserFactory().id, "company": "Alphabet"})
+        job.refresh_from_db()
+        self.assertEqual(job.company, "Company")
+
+    def test_update_job_owner_unchanged(self):
+        job = JobFactory()
+        other_user = UserFactory()
+        with self.assertRaises(AttributeError):
+            query.update_job({"id": job.id, "user_id": job.user_id, "user": other_user.id})
+        with self.assertRaises(ObjectDoesNotExist):
+            query.update_job({"id": job.id, "user_id": other_user.id})
+        job.refresh_from_db()
+        self.assertNotEqual(job.user_id, other_user.id)
+
+    def test_update_job_foreign_key_name(self):
+        job = JobFactory()
+        column = KanbanColumnFactory(user=job.user)
+        query.update_job({"id": job.id, "kcolumn": column.id})
+        job.refresh_from_db()
+        self.assertEqual(job.kcolumn_id, column.id)
+
 
 class GetAllJobsTests(TestCase):
     def test_get_minimum_jobs(self):
@@ -105,6 +163,15 @@ class DeleteJobTests(TestCase):
 
         self.assertEqual(models.Job.objects.count(), 1)
 
+    def test_job_deletion_defers_text(self):
+        job = JobFactory(cover_letter="Dear hiring manager")
+        with CaptureQueriesContext(connection) as queries:
+            query.delete_job(job.user.id, job.id)
+        selects = [captured["sql"] for captured in queries if captured["sql"].startswith("SELECT")]
+        self.assertTrue(selects)
+        for sql in selects:
+            self.assertNotIn("cover_letter", sql)
+
 
 class CreateReviewRequestTests(TestCase):
     def test_create_review_request(self):
@@ -161,6 +228,23 @@ class GetReviewRequestsForUserTests(TestCase):
         requests_to_requester = query.get_review_requests_for_user({"user_id": review_request.job.user.id})
         self.assertEqual(len(requests_to_requester), 0)
 
+    def test_get_review_requests_for_user_query_count(self):
+        reviewer = UserFactory()
+        for _ in range(3):
+            ReviewRequestFactory(reviewer=reviewer)
+
+        # One query to check the user exists, one for the requests and their jobs
+        with self.assertNumQueries(2):
+            review_requests = query.get_review_requests_for_user({"user_id": reviewer.id})
+            [review_request.to_dict() for review_request in review_requests]
+
+    def test_get_review_requests_for_user_defers_job_text(self):
+        review_request = ReviewRequestFactory()
+        with CaptureQueriesContext(connection) as queries:
+            list(query.get_review_requests_for_user({"user_id": review_request.reviewer.id}))
+        for field in query.HEAVY_JOB_FIELDS:
+            self.assertNotIn(field, queries[-1]["sql"])
+
 
 class CreateReviewTests(TestCase):
     def test_create_review(self):
@@ -207,6 +291,15 @@ class GetReviewsForUserTests(TestCase):
         reviews_to_reviewer = query.get_reviews_for_user({"user_id": request.reviewer.id})
         self.assertEqual(len(reviews_to_reviewer), 0)
 
+    def test_get_reviews_for_user_query_count(self):
+        job = JobFactory()
+        for _ in range(3):
+            models.Review.objects.create(request=ReviewRequestFactory(job=job))
+
+        # One query to check the user exists, one for the reviews and their requests
+        with self.assertNumQueries(2):
+            [review.to_dict() for review in query.get_reviews_for_user({"user_id": job.user.id})]
+
     def test_invalid_get_reviews_for_user(self):
         # User doesn't exist
         with self.assertRaises(ObjectDoesNotExist):
@@ -5,7 +5,7 @@ patch("account.decorators.requires_login", lambda *args, **kwargs: lambda x: x).
 
 from django.test import RequestFactory, TestCase  # noqa: E402
 from django.core.exceptions import ObjectDoesNotExist  # noqa: E402
-from job import views  # noqa: E402
+from job import views, business  # noqa: E402
 from job.tests.factories import JobFactory, ReviewRequestFactory, ReviewFactory  # noqa: E402
 from account.tests.factories import UserFactory  # noqa: E402
 
@@ -30,7 +30,32 @@ class TestViews(TestCase):
 
         # Check the response
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(response.content.decode("utf-8"), json.dumps({"jobs": jobs}))
+        self.assertEqual(json.loads(response.content), {"jobs": jobs})
+
+    @patch("job.business.get_minimum_jobs")
+    def test_get_minimum_jobs_not_modified(self, mock_get_minimum_jobs):
+        job = JobFactory()
+        mock_get_minimum_jobs.return_value = []
+        request_body = json.dumps({"user_id": job.user.id}).encode("utf-8")
+        response = views.get_minimum_jobs(
+            self.factory.post("/get_minimum_jobs/", data=request_body, content_type="application/json")
+        )
+        etag = response["ETag"]
+
+        # Answered from the board version, without fetching the jobs
+        mock_get_minimum_jobs.reset_mock()
+        request = self.factory.post(
+            "/get_minimum_jobs/", data=request_body, content_type="application/json", HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(views.get_minimum_jobs(request).status_code, 304)
+        mock_get_minimum_jobs.assert_not_called()
+
+        # Changing a job moves the board to a new version
+        business.update_job({"id": job.id, "user_id": job.user.id, "company": "Alphabet"})
+        request = self.factory.post(
+            "/get_minimum_jobs/", data=request_body, content_type="application/json", HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(views.get_minimum_jobs(request).status_code, 200)
 
     @patch("job.business.get_job_by_id")
     def test_get_job_by_id(self, mock_get_job_by_id):
@@ -57,7 +82,7 @@ class TestViews(TestCase):
 
         # Check the response
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(response.content.decode("utf-8"), json.dumps({"job_data": job.to_dict()}))
+        self.assertEqual(json.loads(response.content), {"job_data": job.to_dict()})
 
     @patch("job.business.create_job")
     def test_create_job(self, mock_create_job):
@@ -75,7 +100,7 @@ class TestViews(TestCase):
 
         # Check the response
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(response.content.decode("utf-8"), json.dumps({"job": job.to_dict()}))
+        self.assertEqual(json.loads(response.content), {"job": job.to_dict()})
 
     @patch("job.business.update_job")
     def test_update_job(self, mock_update_job):
@@ -90,7 +115,7 @@ class TestViews(TestCase):
 
         # Check the response
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(response.content.decode("utf-8"), json.dumps({}))
+        self.assertEqual(json.loads(response.content), {})
 
     @patch("job.business.get_minimum_jobs")
     def test_get_minimum_jobs_with_error(self, mock_get_minimum_jobs):
@@ -156,7 +181,7 @@ class ReviewRequestTests(TestCase):
 
         # Check the response
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(response.content.decode("utf-8"), json.dumps({"review_request": review_request.to_dict()}))
+        self.assertEqual(json.loads(response.content), {"review_request": review_request.to_dict()})
 
     @patch("job.business.create_review_request")
     def test_create_review_request_with_error(self, mock_create_review_request):
@@ -171,7 +196,7 @@ class ReviewRequestTests(TestCase):
 
         # Check the response
         self.assertEqual(response.status_code, 400)
-        self.assertEqual(response.content.decode("utf-8"), json.dumps({"error": "Exception('Something went wrong!')"}))
+        self.assertEqual(json.loads(response.content), {"error": "Exception('Something went wrong!')"})
 
     @patch("job.business.get_review_requests_for_user")
     def test_get_review_requests_for_user(self, mock_get_review_requests_for_user):
@@ -188,8 +213,8 @@ class ReviewRequestTests(TestCase):
 
         self.assertEqual(response.status_code, 200)
         self.assertEqual(
-            response.content.decode("utf-8"),
-            json.dumps({"review_requests": [review_request.to_dict() for review_request in review_requests]}),
+            json.loads(response.content),
+            {"review_requests": [review_request.to_dict() for review_request in review_requests]},
         )
 
     @patch("job.business.get_review_requests_for_user")
@@ -204,7 +229,7 @@ class ReviewRequestTests(TestCase):
 
         response = views.get_review_requests_for_user(request)
         self.assertEqual(response.status_code, 400)
-        self.assertEqual(response.content.decode("utf-8"), json.dumps({"error": "Exception('Something went wrong!')"}))
+        self.assertEqual(json.loads(response.content), {"error": "Exception('Something went wrong!')"})
 
 
 class ReviewTests(TestCase):
@@ -227,7 +252,7 @@ class ReviewTests(TestCase):
 
         # Check the response
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(response.content.decode("utf-8"), json.dumps({"review": review.to_dict()}))
+        self.assertEqual(json.loads(response.content), {"review": review.to_dict()})
 
     @patch("job.business.create_review")
     def test_create_review_with_error(self, mock_create_review):
@@ -242,7 +267,7 @@ class ReviewTests(TestCase):
 
         # Check the response
         self.assertEqual(response.status_code, 400)
-        self.assertEqual(response.content.decode("utf-8"), json.dumps({"error": "Exception('Something went wrong!')"}))
+        self.assertEqual(json.loads(response.content), {"error": "Exception('Something went wrong!')"})
 
     @patch("job.business.get_reviews_for_user")
     def test_get_reviews_for_user(self, mock_get_reviews_for_user):
@@ -257,9 +282,7 @@ class ReviewTests(TestCase):
         response = views.get_reviews_for_user(request)
 
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(
-            response.content.decode("utf-8"), json.dumps({"reviews": [review.to_dict() for review in reviews]})
-        )
+        self.assertEqual(json.loads(response.content), {"reviews": [review.to_dict() for review in reviews]})
 
     @patch("job.business.get_reviews_for_user")
     def test_get_reviews_for_user_with_error(self, mock_get_reviews_for_user):
@@ -273,4 +296,4 @@ class ReviewTests(TestCase):
 
         # Check the response
         self.assertEqual(response.status_code, 400)
-        self.assertEqual(response.content.decode("utf-8"), json.dumps({"error": "Exception('Something went wrong!')"}))
+        self.assertEqual(json.loads(response.content), {"error": "Exception('Something went wrong!')"})
@@ -4,18 +4,20 @@ Job views
 API-layer for job related operations.
 """
 import logging
-from django.http import HttpRequest, JsonResponse
+from django.http import HttpRequest
 from django.views.decorators.http import require_POST
 from django.core.exceptions import ObjectDoesNotExist
 from account.decorators import requires_login
-from jamco.helper import read_request
+from jamco.helper import read_request, JsonResponse, conditional_json
 from . import business
+from board import business as board_business
 
 logger = logging.getLogger(__name__)
 
 
 @require_POST
 @requires_login(allow_friends=True, check_field="user_id")
+@conditional_json(lambda body: board_business.get_board_etag("jobs", body["user_id"]))
 def get_minimum_jobs(request: HttpRequest):
     """
     Gets {id, position, company} for each job a given user has
@@ -26,7 +28,7 @@ def get_minimum_jobs(request: HttpRequest):
     body = read_request(request)
     user_id = body.get("user_id")  # user whose jobs are needed
 
-    logger.debug(f"get_minimum_jobs: {user_id}")
+    logger.debug("get_minimum_jobs: %s", user_id)
 
     try:
         jobs = list(business.get_minimum_jobs(user_id))
@@ -49,7 +51,7 @@ def get_job_by_id(request: HttpRequest):
     user_id = body.get("user_id")
     job_id = body.get("job_id")
 
-    logger.debug(f"get_job_by_id: user: {user_id}, job: {job_id}")
+    logger.debug("get_job_by_id: user: %s, job: %s", user_id, job_id)
 
     try:
         job = business.get_job_by_id(user_id, job_id)
@@ -68,7 +70,7 @@ def create_job(request: HttpRequest):
     """
 
     body = read_request(request)
-    logger.debug(f"create_job: {body}")
+    logger.debug("create_job: %s", body)
 
     try:
         job = business.create_job(body)
@@ -85,7 +87,7 @@ def update_job(request: HttpRequest):
     """
 
     body = read_request(request)
-    logger.debug(f"update_job: {body}")
+    logger.debug("update_job: %s", body)
 
     try:
         business.update_job(body)
@@ -102,7 +104,7 @@ def create_review_request(request: HttpRequest):
     """
 
     body = read_request(request)
-    logger.debug(f"create_review_request: {body}")
+    logger.debug("create_review_request: %s", body)
 
     try:
         review_request = business.create_review_request(body)
@@ -119,7 +121,7 @@ def get_review_requests_for_user(request: HttpRequest):
     """
 
     body = read_request(request)
-    logger.debug(f"get_review_requests_for_user: {body}")
+    logger.debug("get_review_requests_for_user: %s", body)
 
     try:
         review_requests = business.get_review_requests_for_user(body)
@@ -138,7 +140,7 @@ def create_review(request: HttpRequest):
     """
 
     body = read_request(request)
-    logger.debug(f"create_review: {body}")
+    logger.debug("create_review: %s", body)
 
     try:
         review = business.create_review(body)
@@ -155,7 +157,7 @@ def get_reviews_for_user(request: HttpRequest):
     """
 
     body = read_request(request)
-    logger.debug(f"get_reviews_for_user: {body}")
+    logger.debug("get_reviews_for_user: %s", body)
 
     try:
         reviews = business.get_reviews_for_user(body)
@@ -0,0 +1,67 @@
+import json
+from unittest.mock import patch
+
+patch("account.decorators.requires_login", lambda *args, **kwargs: lambda x: x).start()
+from django.test import TransactionTestCase  # noqa: E402
+from django.urls import reverse  # noqa: E402
+from account.tests.factories import PrivacyFactory  # noqa: E402
+from column.tests.factories import KanbanColumnFactory  # noqa: E402
+from job.tests.factories import JobFactory  # noqa: E402
+
+
+class BoardTests(TransactionTestCase):
+    reset_sequences = True
+
+    def setUp(self):
+        self.privacy = PrivacyFactory()
+        self.user = self.privacy.user
+        self.column = KanbanColumnFactory(user=self.user, name="To Apply", column_number=0)
+        self.job = JobFactory(user=self.user, kcolumn=self.column)
+
+    def post(self, name, data):
+        response = self.client.post(reverse(name), json.dumps(data), content_type="application/json")
+        return response.status_code, json.loads(response.content)
+
+    def test_get_board(self):
+        status, board = self.post("get_board", {"user_id": self.user.id})
+
+        self.assertEqual(status, 200)
+        self.assertEqual(board["version"], 0)
+        self.assertEqual(board["columns"], [self.column.to_dict()])
+        self.assertEqual(
+            board["jobs"],
+            [
+                {
+                    "id": self.job.id,
+                    "kcolumn": self.column.id,
+                    "position_title": "Position",
+                    "company": "Company",
+                    "type": None,
+                    "user_id": self.user.id,
+                }
+            ],
+        )
+        self.assertEqual(board["privacies"], self.privacy.to_dict())
+
+    def test_get_board_nonexistent_user(self):
+        status, _ = self.post("get_board", {"user_id": -1})
+        self.assertEqual(status, 400)
+
+    def test_sync_after_board_load(self):
+        _, board = self.post("get_board", {"user_id": self.user.id})
+
+        self.post(
+            "create_job",
+            {"user_id": self.user.id, "kcolumn_id": self.column.id, "position_title": "Dev", "company": "Google"},
+        )
+        self.post("update_job", {"id": self.job.id, "user_id": self.user.id, "company": "Alphabet"})
+
+        status, changes = self.post("get_board_changes", {"user_id": self.user.id, "since": board["version"]})
+        self.assertEqual(status, 200)
+        self.assertEqual(changes["version"], board["version"] + 2)
+        self.assertEqual(sorted(job["company"] for job in changes["jobs"]), ["Alphabet", "Google"])
+        self.assertEqual(changes["columns"], [])
+
+        # Nothing new since then
+        _, changes = self.post("get_board_changes", {"user_id": self.user.id, "since": changes["version"]})
+        self.assertEqual(changes["jobs"], [])
@@ -0,0 +1,93 @@
+import json
+from unittest.mock import patch
+
+patch("account.decorators.requires_login", lambda *args, **kwargs: lambda x: x).start()
+from django.core.cache import cache  # noqa: E402
+from django.core.cache.backends.locmem import LocMemCache  # noqa: E402
+from django.test import TransactionTestCase, override_settings  # noqa: E402
+from django.urls import reverse  # noqa: E402
+from account.tests.factories import PrivacyFactory  # noqa: E402
+from column.tests.factories import KanbanColumnFactory  # noqa: E402
+from job.tests.factories import JobFactory  # noqa: E402
+from jamco import cache as user_cache  # noqa: E402
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "integration"}}
+)
+class NoStaleReadsTests(TransactionTestCase):
+    reset_sequences = True
+
+    def setUp(self):
+        cache.clear()
+        user_cache.reset_stats()
+        self.user = PrivacyFactory().user
+        self.column = KanbanColumnFactory(user=self.user, name="To Apply", column_number=0)
+        self.job = JobFactory(user=self.user, kcolumn=self.column)
+
+    def post(self, name, data):
+        response = self.client.post(reverse(name), json.dumps(data), content_type="application/json")
+        self.assertEqual(response.status_code, 200)
+        return json.loads(response.content)
+
+    def test_columns(self):
+        self.post("get_columns", {"user_id": self.user.id})
+        self.assertEqual(self.post("get_columns", {"user_id": self.user.id})["columns"][0]["name"], "To Apply")
+        self.assertEqual(user_cache.get_stats()["columns.hits"], 1)
+
+        self.post(
+            "update_columns",
+            {"user_id": self.user.id, "payload": [{"id": self.column.id, "name": "Applying", "column_number": 0}]},
+        )
+        self.assertEqual(self.post("get_columns", {"user_id": self.user.id})["columns"][0]["name"], "Applying")
+
+    def test_minimum_jobs(self):
+        self.post("get_minimum_jobs", {"user_id": self.user.id})
+        self.assertEqual(self.post("get_minimum_jobs", {"user_id": self.user.id})["jobs"][0]["company"], "Company")
+        self.assertEqual(user_cache.get_stats()["minimum_jobs.hits"], 1)
+
+        self.post("update_job", {"id": self.job.id, "user_id": self.user.id, "company": "Alphabet"})
+        self.assertEqual(self.post("get_minimum_jobs", {"user_id": self.user.id})["jobs"][0]["company"], "Alphabet")
+
+        self.post(
+            "create_job",
+            {"user_id": self.user.id, "kcolumn_id": self.column.id, "position_title": "Dev", "company": "Google"},
+        )
+        self.assertEqual(len(self.post("get_minimum_jobs", {"user_id": self.user.id})["jobs"]), 2)
+
+        # Deleting a column takes its jobs with it
+        self.post("update_columns", {"user_id": self.user.id, "payload": []})
+        self.assertEqual(self.post("get_minimum_jobs", {"user_id": self.user.id})["jobs"], [])
+
+    def test_privacies(self):
+        self.post("get_user_privacies", {"user_id": self.user.id})
+        self.assertTrue(self.post("get_user_privacies", {"user_id": self.user.id})["share_kanban"])
+        self.assertEqual(user_cache.get_stats()["privacies.hits"], 1)
+
+        self.post("update_privacies", {"user_id": self.user.id, "privacies": {"share_kanban": False}})
+        self.assertFalse(self.post("get_user_privacies", {"user_id": self.user.id})["share_kanban"])
+
+    def test_etag_matches_body_across_workers(self):
+        # Two workers with their own per-process caches
+        worker_a, worker_b = LocMemCache("worker-a", {}), LocMemCache("worker-b", {})
+        worker_a.clear()
+        worker_b.clear()
+        with patch("jamco.cache.cache", worker_b):
+            before = self.client.post(reverse("get_columns"), {"user_id": self.user.id}, "application/json")
+        with patch("jamco.cache.cache", worker_a):
+            self.post(
+                "update_columns",
+                {"user_id": self.user.id, "payload": [{"id": self.column.id, "name": "Applying", "column_number": 0}]},
+            )
+
+        # The other worker's cached columns are for an older board version, so they aren't sent with the new etag
+        with patch("jamco.cache.cache", worker_b):
+            after = self.client.post(
+                reverse("get_columns"),
+                {"user_id": self.user.id},
+                "application/json",
+                HTTP_IF_NONE_MATCH=before["ETag"],
+            )
+        self.assertEqual(after.status_code, 200)
+        self.assertNotEqual(after["ETag"], before["ETag"])
+        self.assertEqual(json.loads(after.content)["columns"][0]["name"], "Applying")
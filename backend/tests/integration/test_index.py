@@ -0,0 +1,56 @@
+import gzip
+from unittest.mock import patch
+from django.test import TestCase
+from jamco import views
+
+
+@patch("jamco.settings.CACHE_SPA_SHELL", True)
+class CachedShellTests(TestCase):
+    def setUp(self):
+        views._shell = None
+
+    def test_shell(self):
+        response = self.client.get("/")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'<div id="app"></div>', response.content)
+        self.assertIn("csrftoken", response.cookies)
+        self.assertNotIn(b"csrfmiddlewaretoken", response.content)
+        self.assertIn("ETag", response)
+        self.assertIn("Last-Modified", response)
+        self.assertIn("Accept-Encoding", response["Vary"])
+
+    def test_shell_compressed(self):
+        plain = self.client.get("/").content
+
+        response = self.client.get("/", HTTP_ACCEPT_ENCODING="gzip, deflate")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(response.content), plain)
+
+        if views.brotli is not None:
+            response = self.client.get("/sandbox", HTTP_ACCEPT_ENCODING="gzip, deflate, br")
+            self.assertEqual(response["Content-Encoding"], "br")
+            self.assertEqual(views.brotli.decompress(response.content), plain)
+
+    def test_shell_not_modified(self):
+        response = self.client.get("/", HTTP_ACCEPT_ENCODING="gzip")
+        response = self.client.get("/", HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+        # The csrf cookie is still issued
+        self.assertIn("csrftoken", response.cookies)
+
+        # A different encoding is a different representation
+        response = self.client.get("/", HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 200)
+
+    def test_shell_rebuilt_on_new_bundle(self):
+        with patch("jamco.views.render_vite_bundle") as mock_bundle:
+            mock_bundle.return_value = "bundle-one"
+            self.client.get("/")
+            shell = views._shell
+            self.client.get("/")
+            self.assertIs(views._shell, shell)
+
+            mock_bundle.return_value = "bundle-two"
+            self.client.get("/")
+            self.assertIsNot(views._shell, shell)
@@ -178,7 +178,7 @@ class UpdateJobTests(TransactionTestCase):
         # Check the response
         self.assertEqual(response.status_code, 200)
         self.assertEqual(len(Job.objects.all()), 1)
-        self.assertEqual(response.content.decode("utf-8"), json.dumps({}))
+        self.assertEqual(json.loads(response.content), {})
 
         self.assertEqual(
             Job.objects.get(id=1).to_dict(),
@@ -252,8 +252,8 @@ class UpdateJobTests(TransactionTestCase):
         self.assertEqual(response.status_code, 400)
         self.assertEqual(len(Job.objects.all()), 1)
         self.assertEqual(
-            response.content.decode("utf-8"),
-            json.dumps({"error": "AttributeError('Job has no attribute invalid')"}),
+            json.loads(response.content),
+            {"error": "AttributeError('Job has no attribute invalid')"},
         )
 
         self.assertEqual(
@@ -328,8 +328,8 @@ class UpdateJobTests(TransactionTestCase):
         self.assertEqual(response.status_code, 400)
         self.assertEqual(len(Job.objects.all()), 1)
         self.assertEqual(
-            response.content.decode("utf-8"),
-            json.dumps({"error": "DoesNotExist('Job matching query does not exist.')"}),
+            json.loads(response.content),
+            {"error": "DoesNotExist('Job matching query does not exist.')"},
         )
 
         self.assertEqual(
@@ -411,7 +411,7 @@ class GetMinimumJobsTests(TransactionTestCase):
 
         # Check the response
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(response.content.decode("utf-8"), json.dumps({"jobs": jobs}))
+        self.assertEqual(json.loads(response.content), {"jobs": jobs})
 
     def test_get_minimum_jobs_nonexistent_user(self):
         # Get Min Jobs
@@ -425,7 +425,7 @@ class GetMinimumJobsTests(TransactionTestCase):
 
         # Check the response
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(response.content.decode("utf-8"), json.dumps({"jobs": jobs}))
+        self.assertEqual(json.loads(response.content), {"jobs": jobs})
 
 
 class GetJobByIdTests(TransactionTestCase):
@@ -482,7 +482,7 @@ class GetJobByIdTests(TransactionTestCase):
         # Check the response
         self.assertEqual(len(Job.objects.all()), 1)
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(response.content.decode("utf-8"), json.dumps({"job_data": response_json}))
+        self.assertEqual(json.loads(response.content), {"job_data": response_json})
 
     def test_get_job_by_id_with_invalid_user_error(self):
         self.assertEqual(len(Job.objects.all()), 0)
@@ -535,8 +535,8 @@ class GetJobByIdTests(TransactionTestCase):
         self.assertEqual(len(Job.objects.all()), 1)
         self.assertEqual(response.status_code, 400)
         self.assertEqual(
-            response.content.decode("utf-8"),
-            json.dumps({"error": "ObjectDoesNotExist('Job with that User does not exist')"}),
+            json.loads(response.content),
+            {"error": "ObjectDoesNotExist('Job with that User does not exist')"},
         )
 
     def test_get_job_by_id_invalid_job_error(self):
@@ -553,8 +553,8 @@ class GetJobByIdTests(TransactionTestCase):
         self.assertEqual(len(Job.objects.all()), 0)
         self.assertEqual(response.status_code, 400)
         self.assertEqual(
-            response.content.decode("utf-8"),
-            json.dumps({"error": "ObjectDoesNotExist('Job with that User does not exist')"}),
+            json.loads(response.content),
+            {"error": "ObjectDoesNotExist('Job with that User does not exist')"},
         )
 
     def test_create_review_request(self):
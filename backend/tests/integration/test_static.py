@@ -0,0 +1,82 @@
+import gzip
+import os
+import tempfile
+from unittest.mock import patch
+from django.http import Http404
+from django.test import RequestFactory, TestCase
+from jamco import storage, views
+
+ASSET = b"console.log('hello world');\n" * 100
+
+
+class StaticTests(TestCase):
+    def setUp(self):
+        self.static_root = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.static_root, "dist", "assets"))
+        self.hashed_path = os.path.join(self.static_root, "dist", "assets", "index-3b8daa75.js")
+        with open(self.hashed_path, "wb") as fd:
+            fd.write(ASSET)
+        for path in ("logo-long.png", "icon-changelink.svg", os.path.join("dist", "manifest.json")):
+            with open(os.path.join(self.static_root, path), "wb") as fd:
+                fd.write(b"not hashed")
+        storage.compress_file(self.hashed_path)
+
+        static_root_patch = patch("jamco.settings.STATIC_ROOT", self.static_root)
+        static_root_patch.start()
+        self.addCleanup(static_root_patch.stop)
+
+    def test_compress_file(self):
+        self.assertTrue(os.path.isfile(self.hashed_path + ".gz"))
+        with open(self.hashed_path + ".gz", "rb") as fd:
+            self.assertEqual(gzip.decompress(fd.read()), ASSET)
+        if storage.brotli is not None:
+            with open(self.hashed_path + ".br", "rb") as fd:
+                self.assertEqual(storage.brotli.decompress(fd.read()), ASSET)
+
+    def test_serve_static(self):
+        response = self.client.get("/static/dist/assets/index-3b8daa75.js")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), ASSET)
+        self.assertEqual(response["Cache-Control"], "public, max-age=31536000, immutable")
+        self.assertNotIn("Content-Encoding", response)
+
+        # Files without a content hash have to be revalidated, whatever their name looks like
+        for path in ("logo-long.png", "icon-changelink.svg", "dist/manifest.json"):
+            response = self.client.get(f"/static/{path}")
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response["Cache-Control"], "public, max-age=0, must-revalidate")
+
+    def test_serve_static_precompressed(self):
+        response = self.client.get("/static/dist/assets/index-3b8daa75.js", HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(b"".join(response.streaming_content)), ASSET)
+
+        if storage.brotli is not None:
+            response = self.client.get("/static/dist/assets/index-3b8daa75.js", HTTP_ACCEPT_ENCODING="gzip, br")
+            self.assertEqual(response["Content-Encoding"], "br")
+
+    def test_serve_static_not_modified(self):
+        etag = self.client.get("/static/dist/assets/index-3b8daa75.js")["ETag"]
+        response = self.client.get("/static/dist/assets/index-3b8daa75.js", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_serve_static_range(self):
+        response = self.client.get(
+            "/static/dist/assets/index-3b8daa75.js", HTTP_RANGE="bytes=0-9", HTTP_ACCEPT_ENCODING="gzip"
+        )
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response.content, ASSET[:10])
+        self.assertEqual(response["Content-Range"], f"bytes 0-9/{len(ASSET)}")
+        self.assertNotIn("Content-Encoding", response)
+
+        response = self.client.get("/static/dist/assets/index-3b8daa75.js", HTTP_RANGE="bytes=-5")
+        self.assertEqual(response.content, ASSET[-5:])
+
+        response = self.client.get("/static/dist/assets/index-3b8daa75.js", HTTP_RANGE=f"bytes={len(ASSET)}-")
+        self.assertEqual(response.status_code, 416)
+
+    def test_serve_static_missing(self):
+        self.assertEqual(self.client.get("/static/dist/missing.js").status_code, 404)
+        # Paths can't escape the static root
+        with self.assertRaises(Http404):
+            views.serve_static(RequestFactory().get("/"), "../manage.py")
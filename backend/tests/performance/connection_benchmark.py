@@ -0,0 +1,50 @@
+"""
+Benchmark for opening a new database connection from the backend.
+
+Opens fresh connections to the database configured for the backend (postgres directly, or pgbouncer with
+POSTGRES_HOST/POSTGRES_PORT pointed at it) and times each one up to its first query, which is when pgbouncer hands
+out a server connection. Run it while a locust swarm is going to see the setup cost under load.
+
+Run in the backend container, from the backend directory: `python tests/performance/connection_benchmark.py [count]`
+"""
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "jamco.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.db import connection  # noqa: E402
+
+CONNECTIONS = 200
+
+
+def time_connection() -> float:
+    connection.close()
+    start = time.perf_counter()
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+    return time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else CONNECTIONS
+    timings = sorted(time_connection() for _ in range(count))
+    connection.close()
+
+    database = settings.DATABASES["default"]
+    print(f"{connection.vendor} at {database['HOST']}:{database['PORT']}, {count} connections")
+    print(f"{'mean':>6}: {statistics.mean(timings) * 1e3:8.2f} ms")
+    print(f"{'median':>6}: {statistics.median(timings) * 1e3:8.2f} ms")
+    print(f"{'p95':>6}: {timings[int(len(timings) * 0.95) - 1] * 1e3:8.2f} ms")
+    print(f"{'max':>6}: {timings[-1] * 1e3:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Micro-benchmark for the json codec in jamco.helper.
+
+Compares encoding / decoding a realistic kanban payload (user data, columns, minimum jobs and a full job) with
+the stdlib encoder django's JsonResponse uses against jamco.helper's codec (orjson when installed).
+
+Run from the backend directory: `python tests/performance/json_benchmark.py`
+"""
+import json
+import os
+import sys
+import timeit
+from datetime import date, datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from django.core.serializers.json import DjangoJSONEncoder  # noqa: E402
+from jamco import helper  # noqa: E402
+
+ITERATIONS = 2000
+
+
+def build_payload(job_count=200, friend_count=50):
+    user = {
+        "id": 1,
+        "google_id": "110169484474386276334",
+        "username": "110169484474386276334",
+        "first_name": "John",
+        "last_name": "Doe",
+        "email": "john.doe@gmail.com",
+        "image_url": "https://i.imgur.com/QJpNyuN.png",
+        "country": "Canada",
+        "region": "Manitoba",
+        "city": "Winnipeg",
+        "birthday": date(1999, 2, 12),
+        "field_of_work": "Software",
+        "friends": [
+            {"id": i, "first_name": f"Friend{i}", "last_name": "Doe", "country": "Canada"} for i in range(friend_count)
+        ],
+        "sent_friend_requests": list(range(10)),
+        "received_friend_requests": [
+            {
+                "id": i,
+                "from_user_id": i,
+                "from_user__first_name": "Jane",
+                "from_user__last_name": "Doe",
+                "from_user__country": None,
+                "sent": datetime(2023, 3, 3, 1, 28, 2, 710196, tzinfo=timezone.utc),
+            }
+            for i in range(10)
+        ],
+    }
+    columns = [{"id": i, "name": name, "column_number": i} for i, name in enumerate(["To Apply", "Submitted", "OA"])]
+    jobs = [
+        {
+            "id": i,
+            "kcolumn": i % 3,
+            "position_title": "Software Developer",
+            "company": "Company",
+            "type": "Full Time",
+            "user_id": 1,
+        }
+        for i in range(job_count)
+    ]
+    job = {
+        "id": 1,
+        "position_title": "Software Developer",
+        "company": "Company",
+        "description": "Build things. " * 300,
+        "notes": "Call back on monday. " * 50,
+        "cover_letter": "Dear hiring manager, " * 400,
+        "kcolumn_id": 1,
+        "user_id": 1,
+        "deadlines": [{"title": "Interview", "date": "2023-04-01T12:00:00.000Z"}] * 5,
+        "type": "Full Time",
+    }
+    return {"user": user, "columns": columns, "jobs": jobs, "job_data": job}
+
+
+def main():
+    payload = build_payload()
+    stdlib_encoded = json.dumps(payload, cls=DjangoJSONEncoder).encode("utf-8")
+
+    results = {
+        "stdlib encode": timeit.timeit(lambda: json.dumps(payload, cls=DjangoJSONEncoder), number=ITERATIONS),
+        "helper encode": timeit.timeit(lambda: helper.json_dumps(payload), number=ITERATIONS),
+        "stdlib decode": timeit.timeit(lambda: json.loads(stdlib_encoded.decode("utf-8")), number=ITERATIONS),
+        "helper decode": timeit.timeit(lambda: helper.json_loads(stdlib_encoded), number=ITERATIONS),
+    }
+
+    codec = "orjson" if helper.orjson is not None else "stdlib fallback"
+    print(f"payload: {len(stdlib_encoded)} bytes, {ITERATIONS} iterations, helper codec: {codec}")
+    for name, seconds in results.items():
+        print(f"{name:>14}: {seconds / ITERATIONS * 1e6:9.1f} us/op")
+    print(f"encode speedup: {results['stdlib encode'] / results['helper encode']:.1f}x")
+    print(f"decode speedup: {results['stdlib decode'] / results['helper decode']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
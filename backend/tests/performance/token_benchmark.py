@@ -0,0 +1,59 @@
+"""
+Micro-benchmark for authenticating a request's auth token.
+
+Compares account.business.validate_token (decrypt, parse and look the user up on every request) against
+validate_token_cached, with the token's decrypted fields in the per-process LRU and the user's row in the
+configured user cache (CACHE_BACKEND), and with the LRU alone (CACHE_BACKEND=dummy).
+Against redis, a cached lookup costs two round trips (the generation, then the row), so compare it with the
+unique-index SELECT it replaces on the same network.
+
+Run from the backend directory: `python tests/performance/token_benchmark.py` (uses a throwaway test database)
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "jamco.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.cache import caches  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test.utils import override_settings  # noqa: E402
+from django.utils import timezone  # noqa: E402
+from account import business  # noqa: E402
+from account.auth_utils import encrypt_token  # noqa: E402
+from account.models import User  # noqa: E402
+
+ITERATIONS = 2000
+DUMMY_CACHE = {"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+
+
+def main():
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        user = User.objects.create(username="benchmark", google_id="110169484474386276334", last_login=timezone.now())
+        token = encrypt_token(user.google_id, user.last_login)
+        # Warm the caches; outside a transaction, loaded rows are stored straight away
+        business.validate_token_cached(token)
+        business.validate_token_cached(token)
+
+        results = {"uncached": timeit.timeit(lambda: business.validate_token(token), number=ITERATIONS)}
+        results[f"cached ({caches['default'].__class__.__name__})"] = timeit.timeit(
+            lambda: business.validate_token_cached(token), number=ITERATIONS
+        )
+        with override_settings(CACHES=DUMMY_CACHE):
+            results["token LRU only"] = timeit.timeit(lambda: business.validate_token_cached(token), number=ITERATIONS)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    print(f"{connection.vendor}, {ITERATIONS} iterations")
+    for name, seconds in results.items():
+        print(f"{name:>24}: {seconds / ITERATIONS * 1e6:9.1f} us/op")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,9 @@ import Cookies from 'js-cookie'
 
 const prodMode = import.meta.env.PROD
 const baseUrl = prodMode ? 'https://jamco.pro/' : 'http://localhost:8000/'
+// Last ETag and response body of each read request, so unchanged data is
+// revalidated with If-None-Match instead of being sent again
+const etagCache = new Map()
 /**
  * Send a post request to the backend
  */
@@ -10,21 +13,33 @@ export async function postRequest(url, data) {
   // eslint-disable-next-line no-param-reassign
   if (url.startsWith('/')) url = url.substring(1)
   try {
+    const body = JSON.stringify(data)
+    const cacheKey = `${url} ${body}`
+    const cached = etagCache.get(cacheKey)
+    const headers = {
+      'Content-Type': 'application/json',
+      'X-CSRFToken': getCSRFToken(),
+    }
+    if (cached) headers['If-None-Match'] = cached.etag
     const response = await fetch(baseUrl + url, {
       method: 'POST',
-      headers: {
-        'Content-Type': 'application/json',
-        'X-CSRFToken': getCSRFToken(),
-      },
+      headers,
       referrerPolicy: 'no-referrer-when-downgrade',
       credentials: 'include',
-      body: JSON.stringify(data),
+      body,
     })
+    if (response.status === 304 && cached) {
+      // parsed fresh each time, so callers can't modify the cached copy
+      return JSON.parse(cached.text)
+    }
     if (response.status !== 200) {
       console.error(response)
       throw new Error('Error sending post request')
     }
-    return response.json()
+    const text = await response.text()
+    const etag = response.headers.get('ETag')
+    if (etag) etagCache.set(cacheKey, { etag, text })
+    return JSON.parse(text)
   } catch (e) {
     console.error(e)
     throw new Error('Error sending post request')